@@ -0,0 +1,71 @@
+"""
+Benchmark pentru RabbitPublisher pe broker-ul AMQP din proces: costul lui
+publish() pe calea request-ului, debitul de golire a buffer-ului și
+comportamentul la o pană de broker.
+
+Broker-ul din proces simulează un round trip de --rtt milisecunde pentru
+fiecare operație care așteaptă răspunsul lui; benchmark-ul raportează câte
+mesaje s-au publicat per round trip (1 = confirmare sincronă per mesaj).
+
+    python benchmarks/bench_publisher.py --messages 20000 --outage 0.5 --rtt 1
+"""
+import argparse
+import os
+import sys
+import time
+
+from harness import ROOT, Timer, percentile
+from standins import InProcessBroker
+
+sys.path.insert(0, os.path.join(ROOT, 'services', 'ticketing-service'))
+import publisher as publisher_module  # noqa: E402
+
+
+def wait_delivered(broker, expected, timeout=30):
+    """Până ajung toate mesajele în coadă (buffer-ul gol nu ajunge: un lot poate fi încă pe drum)."""
+    deadline = time.monotonic() + timeout
+    while broker.depth('ticket_booked') < expected and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--messages', type=int, default=20000)
+    parser.add_argument('--outage', type=float, default=0.5, help='secunde de pană simulată')
+    parser.add_argument('--rtt', type=float, default=1.0, help='round trip simulat până la broker (ms)')
+    args = parser.parse_args()
+
+    publisher_module.PUBLISHER_RECONNECT_DELAY = 0.05
+    broker = InProcessBroker()
+    broker.rtt = args.rtt / 1000
+    pub = publisher_module.RabbitPublisher('in-process', 'ticket_booked', connection_factory=broker.connect,
+                                           buffer_size=args.messages)
+
+    enqueue = []
+    with Timer() as drain:
+        for i in range(args.messages):
+            with Timer() as t:
+                pub.publish({'event_id': 1, 'code': f'{i:08x}'})
+            enqueue.append(t.elapsed)
+        wait_delivered(broker, args.messages)
+    print(f"publish() p50={percentile(enqueue, 50) * 1e6:.1f}us p99={percentile(enqueue, 99) * 1e6:.1f}us "
+          f"drain={args.messages / drain.elapsed:.0f} msg/s "
+          f"messages/round trip={args.messages / max(broker.round_trips, 1):.1f} (rtt={args.rtt}ms)")
+
+    broker.down = True
+    for i in range(1000):
+        pub.publish({'event_id': 1, 'code': f'outage-{i}'})
+    time.sleep(args.outage)
+    print(f"during outage: {pub.stats()}")
+    broker.down = False
+    expected = args.messages + 1000
+    wait_delivered(broker, expected)
+
+    delivered = broker.depth('ticket_booked')
+    print(f"after recovery: {pub.stats()} delivered={delivered}")
+    print('OK' if delivered == expected else f'FAIL: expected {expected} delivered messages')
+    return 0 if delivered == expected else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
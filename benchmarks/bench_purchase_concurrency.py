@@ -0,0 +1,70 @@
+"""
+Test de concurență pentru calea de cumpărare: multe cumpărări în paralel
+pe un eveniment mic; la final numărul de bilete vândute trebuie să fie exact.
+
+    python benchmarks/bench_purchase_concurrency.py --attempts 5000 --tickets 100
+"""
+import argparse
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from harness import Timer, load_service
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--attempts', type=int, default=2000)
+    parser.add_argument('--tickets', type=int, default=50)
+    parser.add_argument('--workers', type=int, default=32)
+    parser.add_argument('--shards', type=int, default=0, help='inventory_shards pentru eveniment')
+    args = parser.parse_args()
+
+    svc = load_service('ticketing-service')
+    app, db = svc.app, svc.db
+
+    with app.app_context():
+        event = svc.Event(name='Bench', starts_at=datetime(2030, 1, 1), total_tickets=args.tickets,
+                          inventory_shards=args.shards)
+        if args.shards:
+            event.shards = [svc.InventoryShard(shard_no=i, capacity=c, sold=0)
+                            for i, c in enumerate(svc.split_capacity(args.tickets, args.shards))]
+        db.session.add(event)
+        db.session.commit()
+        event_id = event.id
+
+    def attempt(i):
+        with app.app_context():
+            try:
+                svc.purchase_ticket(event_id, f'buyer-{i}')
+                db.session.commit()
+                return 'sold'
+            except svc.PurchaseError:
+                db.session.rollback()
+                return 'rejected'
+            except Exception as e:
+                db.session.rollback()
+                return f'error: {e.__class__.__name__}'
+
+    with Timer() as t, ThreadPoolExecutor(args.workers) as pool:
+        results = list(pool.map(attempt, range(args.attempts)))
+
+    with app.app_context():
+        event = db.session.get(svc.Event, event_id)
+        ticket_count = svc.Ticket.query.filter_by(event_id=event_id).count()
+        tickets_sold = event.sold_count()
+
+    sold = results.count('sold')
+    rejected = results.count('rejected')
+    errors = len(results) - sold - rejected
+    print(f"attempts={args.attempts} sold={sold} rejected={rejected} errors={errors} "
+          f"elapsed={t.elapsed:.2f}s rate={args.attempts / t.elapsed:.0f}/s")
+    print(f"events.tickets_sold={tickets_sold} tickets rows={ticket_count} capacity={args.tickets}")
+
+    ok = tickets_sold == ticket_count == sold == args.tickets and errors == 0
+    print('OK' if ok else 'FAIL: inventory mismatch')
+    return 0 if ok else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,45 @@
+"""
+Benchmark pentru rate limiter: cost per verificare, memoria ocupată la un
+"ticket drop" cu foarte mulți cumpărători distincți și consistența limitei
+între două replici care împart același store.
+
+    python benchmarks/bench_rate_limiter.py --users 200000
+"""
+import argparse
+import os
+import sys
+
+from harness import ROOT, Timer
+from standins import LocalCounterStore
+
+sys.path.insert(0, os.path.join(ROOT, 'services', 'ticketing-service'))
+from ratelimit import (  # noqa: E402
+    MemoryRateLimitBackend, SharedRateLimitBackend, SlidingWindowLimiter,
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--users', type=int, default=200000)
+    parser.add_argument('--max-keys', type=int, default=50000)
+    args = parser.parse_args()
+
+    backend = MemoryRateLimitBackend(max_keys=args.max_keys)
+    limiter = SlidingWindowLimiter(backend, limit=2, window_seconds=60)
+    with Timer() as t:
+        for i in range(args.users):
+            limiter.allow(f'buy_ticket:user-{i}')
+    print(f"memory: {args.users / t.elapsed:.0f} checks/s, keys kept={len(backend)} (cap {args.max_keys})")
+
+    store = LocalCounterStore()
+    replicas = [SlidingWindowLimiter(SharedRateLimitBackend(store), limit=2, window_seconds=60) for _ in range(3)]
+    allowed = sum(replicas[i % 3].allow('buy_ticket:same-user') for i in range(30))
+    print(f"shared: 30 requests over 3 replicas -> {allowed} allowed (limit 2)")
+
+    ok = len(backend) <= args.max_keys and allowed == 2
+    print('OK' if ok else 'FAIL')
+    return 0 if ok else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,85 @@
+"""
+Benchmark pentru validarea biletelor la intrare (POST /scan/<code>).
+
+Măsoară latența (p50 / p99) pentru scanări valide, bilete deja folosite,
+coduri inexistente și coduri greșit tastate (respinse fără DB), apoi
+simulează mai multe porți care scanează simultan aceleași bilete: fiecare
+bilet trebuie acceptat exact o dată.
+
+    python benchmarks/bench_scan.py --tickets 5000 --gates 4
+"""
+import argparse
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from harness import Timer, load_service, percentile
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--tickets', type=int, default=5000)
+    parser.add_argument('--gates', type=int, default=4, help='porți care scanează aceleași coduri')
+    args = parser.parse_args()
+
+    svc = load_service('ticketing-service')
+    app, db = svc.app, svc.db
+    # view-ul fără require_role: măsurăm validarea, nu verificarea JWT
+    scan = svc.scan_ticket.__wrapped__
+
+    with app.app_context():
+        event = svc.Event(name='Bench', starts_at=datetime(2030, 1, 1), total_tickets=args.tickets)
+        db.session.add(event)
+        db.session.flush()
+        codes = list({svc.new_code(event.id) for _ in range(args.tickets)})
+        db.session.execute(svc.insert(svc.Ticket), [
+            {'event_id': event.id, 'keycloak_sub': f'buyer-{i}', 'code': code,
+             'purchased_at': datetime.utcnow()}
+            for i, code in enumerate(codes)
+        ])
+        db.session.commit()
+        event_id = event.id
+
+    def scan_one(code, gate='gate-0'):
+        with app.test_request_context(f'/scan/{code}', method='POST'):
+            svc.request.user_sub = gate
+            start = time.perf_counter()
+            _, status = scan(code)
+            return status, (time.perf_counter() - start) * 1000
+
+    def run_phase(name, phase_codes, expected_status):
+        results = [scan_one(code) for code in phase_codes]
+        latencies = [ms for _, ms in results]
+        wrong = sum(1 for status, _ in results if status != expected_status)
+        print(f"{name:<14} n={len(results)} p50={percentile(latencies, 50):.2f}ms "
+              f"p99={percentile(latencies, 99):.2f}ms wrong_status={wrong}")
+        return wrong
+
+    sample = codes[:min(len(codes), 1000)]
+    wrong = run_phase('valid', sample, 200)
+    wrong += run_phase('already_used', sample, 400)
+    wrong += run_phase('unknown', [svc.new_code(event_id) for _ in sample], 404)
+    wrong += run_phase('typo', [code[:-1] + ('0' if code[-1] != '0' else '1') for code in sample], 400)
+
+    # Mai multe porți scanează toate biletele rămase în același timp
+    remaining = codes[len(sample):]
+    work = [(code, f'gate-{g}') for code in remaining for g in range(args.gates)]
+    with Timer() as t, ThreadPoolExecutor(args.gates) as pool:
+        statuses = [status for status, _ in pool.map(lambda item: scan_one(*item), work)]
+
+    accepted = statuses.count(200)
+    rejected = statuses.count(400)
+    with app.app_context():
+        used = svc.Ticket.query.filter(svc.Ticket.used_at.isnot(None)).count()
+    print(f"race gates={args.gates} scans={len(work)} accepted={accepted} rejected={rejected} "
+          f"elapsed={t.elapsed:.2f}s rate={len(work) / t.elapsed:.0f}/s")
+    print(f"tickets used={used} expected={len(codes)}")
+
+    ok = wrong == 0 and accepted == len(remaining) and rejected == len(work) - accepted and used == len(codes)
+    print('OK' if ok else 'FAIL: double entry or wrong status')
+    return 0 if ok else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,73 @@
+"""
+Benchmark pentru exporturile mari (GET /admin/banned, trimis chunked din cursor).
+
+Pentru două dimensiuni ale tabelei compară varianta veche (obiecte ORM,
+to_dict() și jsonify pe toată lista) cu răspunsul streamed din json_stream.py:
+timpul și vârful de memorie alocată în Python (tracemalloc) cât se consumă
+tot răspunsul. Vârful variantei streamed trebuie să rămână aproximativ același
+când numărul de rânduri crește de zece ori.
+
+    python benchmarks/bench_streaming.py --rows 100000
+"""
+import argparse
+import sys
+import tracemalloc
+from datetime import datetime
+
+from flask import jsonify
+
+from harness import Timer, load_service
+
+
+def measure(app, view):
+    """(secunde, vârf MB, bytes) pentru un răspuns consumat chunk cu chunk."""
+    with app.test_request_context('/admin/banned'):
+        tracemalloc.start()
+        with Timer() as t:
+            response = app.make_response(view())
+            size = sum(len(chunk) for chunk in response.response)
+            response.close()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return t.elapsed, peak / 2 ** 20, size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=100000)
+    args = parser.parse_args()
+
+    svc = load_service('ticketing-service')
+    app, db = svc.app, svc.db
+    # view-ul fără require_role: măsurăm serializarea, nu verificarea JWT
+    streamed_view = svc.list_banned.__wrapped__
+
+    def list_view():
+        banned = svc.BannedUser.query.order_by(svc.BannedUser.created_at.desc()).all()
+        return jsonify([b.to_dict() for b in banned])
+
+    peaks = {}
+    inserted = 0
+    for rows in (args.rows // 10, args.rows):
+        with app.app_context():
+            db.session.execute(svc.insert(svc.BannedUser), [
+                {'keycloak_sub': f'user-{i}', 'reason': 'chargeback', 'created_at': datetime.utcnow()}
+                for i in range(inserted, rows)
+            ])
+            db.session.commit()
+        inserted = rows
+
+        for name, view in (('list', list_view), ('streamed', streamed_view)):
+            elapsed, peak, size = measure(app, view)
+            peaks[name, rows] = peak
+            print(f"{name:<9} rows={rows:<8} elapsed={elapsed * 1000:.0f}ms rate={rows / elapsed:.0f} rows/s "
+                  f"peak={peak:.1f}MB body={size / 2 ** 20:.1f}MB")
+
+    small, large = args.rows // 10, args.rows
+    ok = peaks['streamed', large] < 2 * peaks['streamed', small] + 1
+    print('OK' if ok else 'FAIL: streamed peak memory grows with the result size')
+    return 0 if ok else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,199 @@
+"""
+Test de încărcare pentru sala de așteptare (POST/GET /events/<id>/queue).
+
+Pentru fiecare număr de clienți, toți intră în coadă aproape simultan, fac
+polling la starea lor cât timp recomandă serviciul (poll_after) și cumpără
+un bilet când sunt admiși. Numărăm instrucțiunile SQL pe secundă: cu sala de
+așteptare, vârful trebuie să rămână aproximativ constant (dat de rata de
+admitere), oricât de mulți clienți așteaptă.
+
+    python benchmarks/bench_waiting_room.py --clients 250,500,1000 --rate 50
+    python benchmarks/bench_waiting_room.py --clients 250,500 --baseline
+
+Rata de admitere trebuie să fie sub cât poate scrie baza de date (SQLite
+implicit: câteva sute de instrucțiuni pe secundă), altfel coada nu mai
+contează și benchmark-ul măsoară doar baza de date.
+"""
+import argparse
+import heapq
+import itertools
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+
+from sqlalchemy import event as sa_event
+
+from harness import Timer, load_service, percentile
+from standins import InProcessBroker
+
+
+class Scheduler:
+    """Coadă de acțiuni programate, consumată de un pool de thread-uri."""
+
+    def __init__(self):
+        self._heap = []
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self.pending = 0
+
+    def schedule(self, when, action):
+        with self._cond:
+            heapq.heappush(self._heap, (when, next(self._seq), action))
+            self._cond.notify()
+
+    def add_client(self):
+        with self._cond:
+            self.pending += 1
+
+    def client_done(self):
+        with self._cond:
+            self.pending -= 1
+            self._cond.notify_all()
+
+    def run_worker(self):
+        while True:
+            with self._cond:
+                while True:
+                    if not self.pending:
+                        return
+                    if self._heap:
+                        delay = self._heap[0][0] - time.monotonic()
+                        if delay <= 0:
+                            _, _, action = heapq.heappop(self._heap)
+                            break
+                        self._cond.wait(min(delay, 0.05))
+                    else:
+                        self._cond.wait(0.05)
+            action()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--clients', default='250,500,1000', help='listă de dimensiuni, separate prin virgulă')
+    parser.add_argument('--rate', type=int, default=50, help='admisii pe secundă')
+    parser.add_argument('--workers', type=int, default=32)
+    parser.add_argument('--baseline', action='store_true', help='și fără sală de așteptare, pentru comparație')
+    args = parser.parse_args()
+
+    svc = load_service('ticketing-service', WAITING_ROOM_BURST=20, WAITING_ROOM_MIN_POLL=0.5)
+    app, db = svc.app, svc.db
+    # evenimentele din outbox merg la un broker în proces, nu la host-ul `rabbitmq`
+    svc.publisher.connection_factory = InProcessBroker().connect
+
+    statements = Counter()
+    statements_lock = threading.Lock()
+
+    def count_statement(*_):
+        with statements_lock:
+            statements[int(time.monotonic())] += 1
+
+    with app.app_context():
+        sa_event.listen(db.engine, 'before_cursor_execute', count_statement)
+
+    sizes = [int(n) for n in args.clients.split(',')]
+    runs = [(n, args.rate) for n in sizes] + ([(n, 0) for n in sizes] if args.baseline else [])
+    client_ids = itertools.count()
+    results = []
+
+    for clients, rate in runs:
+        with app.app_context():
+            event = svc.Event(name='On-sale', starts_at=datetime(2030, 1, 1), total_tickets=clients,
+                              admission_rate=rate)
+            db.session.add(event)
+            db.session.commit()
+            event_id = event.id
+
+        scheduler = Scheduler()
+        stats = Counter()
+        poll_latencies = []
+        lock = threading.Lock()
+        local = threading.local()
+
+        def client(method, url, **kwargs):
+            if not hasattr(local, 'client'):
+                local.client = app.test_client()
+            return getattr(local.client, method)(url, **kwargs)
+
+        def start_client():
+            n = next(client_ids)
+            # token deja verificat: benchmark-ul măsoară coada, nu RS256
+            bearer = f'bench-{n}'
+            svc.token_cache.put(bearer, {'sub': f'client-{n}', 'exp': time.time() + 3600,
+                                         'realm_access': {'roles': ['USER']}})
+            headers = {'Authorization': f'Bearer {bearer}'}
+
+            def buy(queue_token):
+                h = dict(headers, **({'X-Queue-Token': queue_token} if queue_token else {}))
+                status = client('post', f'/events/{event_id}/tickets', headers=h).status_code
+                with lock:
+                    stats[f'buy_{status}'] += 1
+                scheduler.client_done()
+
+            def poll(queue_token):
+                start = time.perf_counter()
+                state = client('get', f'/events/{event_id}/queue?token={queue_token}').get_json()
+                with lock:
+                    stats['polls'] += 1
+                    poll_latencies.append((time.perf_counter() - start) * 1000)
+                if state['admitted']:
+                    buy(queue_token)
+                else:
+                    scheduler.schedule(time.monotonic() + state['poll_after'], lambda: poll(queue_token))
+
+            def join():
+                data = client('post', f'/events/{event_id}/queue', headers=headers).get_json()
+                with lock:
+                    stats['joins'] += 1
+                if data['admitted']:
+                    buy(data['token'])
+                else:
+                    scheduler.schedule(time.monotonic() + data['poll_after'], lambda: poll(data['token']))
+
+            return join
+
+        statements.clear()
+        start = time.monotonic()
+        for _ in range(clients):
+            scheduler.add_client()
+            scheduler.schedule(start + random.random() * 0.5, start_client())
+
+        with Timer() as t:
+            workers = [threading.Thread(target=scheduler.run_worker) for _ in range(args.workers)]
+            for w in workers:
+                w.start()
+            for w in workers:
+                w.join()
+
+        per_second = list(statements.values())
+        total = sum(per_second)
+        results.append({
+            'clients': clients,
+            'mode': f'queue {rate}/s' if rate else 'no queue',
+            'elapsed': t.elapsed,
+            'sold': stats['buy_201'],
+            'polls': stats['polls'],
+            'db_total': total,
+            'db_peak': max(per_second) if per_second else 0,
+            'db_per_client': total / clients,
+            'poll_p99': percentile(poll_latencies, 99),
+        })
+        r = results[-1]
+        print(f"clients={r['clients']:<6} mode={r['mode']:<14} elapsed={r['elapsed']:.1f}s sold={r['sold']:<6} "
+              f"polls={r['polls']:<6} db_statements={r['db_total']:<7} peak_db/s={r['db_peak']:<6} "
+              f"db/client={r['db_per_client']:.1f} poll_p99={r['poll_p99']:.2f}ms")
+
+    queued = [r for r in results if r['mode'] != 'no queue']
+    sold_ok = all(r['sold'] == r['clients'] for r in results)
+    peaks = [r['db_peak'] for r in queued]
+    # vârful de SQL/s nu crește cu numărul de clienți (toleranță pentru zgomot)
+    flat = max(peaks) <= 1.5 * min(peaks) + 50
+    print(f"peak db statements/s with queue: {peaks}")
+    print('OK' if sold_ok and flat else 'FAIL: DB load grows with clients or tickets missing')
+    return 0 if sold_ok and flat else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
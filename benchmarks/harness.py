@@ -0,0 +1,64 @@
+"""
+Utilitare comune pentru scripturile din benchmarks/.
+
+Serviciile se încarcă direct din services/<nume>/app.py, cu o bază de date
+locală (SQLite implicit, sau Postgres prin BENCH_DATABASE_URL), fără Docker.
+"""
+import importlib.util
+import os
+import secrets
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def default_database_url():
+    url = os.getenv('BENCH_DATABASE_URL')
+    if url:
+        return url
+    path = os.path.join(tempfile.mkdtemp(prefix='eventflow-bench-'), 'bench.db')
+    # timeout mare: sub SQLite scrierile concurente așteaptă lock-ul bazei
+    return f'sqlite:///{path}?timeout=60'
+
+
+def load_service(name, database_url=None, **env):
+    """Importă app.py al serviciului `name` și creează tabelele."""
+    os.environ['DATABASE_URL'] = database_url or default_database_url()
+    # secretele obligatorii ale serviciilor; aleatoare, ca să nu existe o cheie publică
+    os.environ.setdefault('MANIFEST_SIGNING_KEY', secrets.token_hex(32))
+    os.environ.setdefault('WAITING_ROOM_SECRET', secrets.token_hex(32))
+    os.environ.update({k: str(v) for k, v in env.items()})
+
+    service_dir = os.path.join(ROOT, 'services', name)
+    if service_dir not in sys.path:
+        sys.path.insert(0, service_dir)
+
+    module_name = name.replace('-', '_') + '_app'
+    spec = importlib.util.spec_from_file_location(module_name, os.path.join(service_dir, 'app.py'))
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    spec.loader.exec_module(module)
+
+    with module.app.app_context():
+        module.db.drop_all()
+        module.db.create_all()
+    return module
+
+
+def percentile(samples, pct):
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+class Timer:
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.elapsed = time.perf_counter() - self.start
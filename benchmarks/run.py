@@ -0,0 +1,447 @@
+"""
+Suita de benchmark-uri a serviciilor, fără Docker: Keycloak, RabbitMQ și
+Redis sunt înlocuiți de standins.py, baza de date e un SQLite temporar (sau
+Postgres prin BENCH_DATABASE_URL). Cererile trec prin tot stack-ul WSGI, cu
+token-uri RS256 reale.
+
+Scenarii:
+- onsale:        deschiderea vânzărilor, mulți cumpărători simultan pe un
+                 eveniment cu mai puține locuri decât cereri;
+- scan:          deschiderea porților, mai multe porți scanează în paralel,
+                 cu reluări și coduri necunoscute;
+- browse:        catalogul (paginile GET /events, detalii, revalidări ETag);
+- notifications: consumer-ul notification-service golește coada ticket_booked.
+
+Pentru fiecare scenariu: p50/p99, cereri pe secundă și instrucțiuni SQL per
+cerere (doar cele de pe thread-urile care servesc cereri; cele din thread-urile
+de background sunt raportate separat). Serviciile rulează cu SQL_PROFILING, iar
+cel mai mare număr de instrucțiuni dintr-o cerere, pe rută, trebuie să rămână
+în QUERY_BUDGETS: un N+1 nou (o relație lazy citită în buclă) pică scenariul
+chiar dacă latența nu se schimbă vizibil. Rezultatele se scriu în JSON și se
+pot compara între commit-uri:
+
+    python benchmarks/run.py --output before.json
+    python benchmarks/run.py --output after.json --compare before.json
+    python benchmarks/run.py --scenarios onsale,scan --quick
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime
+
+import sqlalchemy
+from sqlalchemy import event as sa_event
+
+from harness import ROOT, Timer, load_service, percentile
+from standins import InProcessBroker, LocalKeycloak
+
+
+SCENARIOS = ('onsale', 'scan', 'browse', 'notifications')
+# Metrici comparate cu --compare; True = mai mare e mai bine
+COMPARED_METRICS = {'rps': True, 'p50_ms': False, 'p99_ms': False, 'queries_per_request': False}
+# Numărul maxim de instrucțiuni SQL într-o singură cerere, pe rută (X-Query-Count)
+QUERY_BUDGETS = {
+    'POST /events/<int:event_id>/tickets': 5,
+    'POST /scan/<code>': 2,
+    'GET /events': 1,
+    'GET /events/<int:event_id>': 1,
+}
+# Când shard-ul ales e gol, cumpărarea mai caută unul cu loc (SELECT + UPDATE + rezervare)
+SHARDED_PURCHASE_BUDGET = 8
+# Sub SQLite așteptarea lock-ului de scriere intră în durata instrucțiunii; logăm doar extremele
+BENCH_SLOW_QUERY_MS = 2000
+
+
+class StatementCounter:
+    """Numără instrucțiunile SQL ale unui engine, separat pentru thread-urile marcate cu measuring()."""
+
+    def __init__(self, engine):
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self.request = 0
+        self.background = 0
+        sa_event.listen(engine, 'before_cursor_execute', self._count)
+
+    def _count(self, *_):
+        with self._lock:
+            if getattr(self._local, 'active', False):
+                self.request += 1
+            else:
+                self.background += 1
+
+    @contextmanager
+    def measuring(self):
+        self._local.active = True
+        try:
+            yield
+        finally:
+            self._local.active = False
+
+    def reset(self):
+        with self._lock:
+            self.request = self.background = 0
+
+
+class Bench:
+    """Serviciile încărcate o singură dată, împreună cu înlocuitorii lor."""
+
+    def __init__(self, args):
+        self.args = args
+        self.rng = None
+        self.keycloak = LocalKeycloak()
+        self.broker = InProcessBroker()
+        self._ticketing = None
+        self._notifications = None
+
+    @property
+    def ticketing(self):
+        if self._ticketing is None:
+            svc = load_service('ticketing-service', SQL_PROFILING='true', SQL_SLOW_QUERY_MS=BENCH_SLOW_QUERY_MS,
+                               **self.keycloak.env())
+            svc.publisher.connection_factory = self.broker.connect
+            with svc.app.app_context():
+                svc.counter = StatementCounter(svc.db.engine)
+            # pornim cald: cheile JWKS și lista de banați sunt deja încărcate într-un worker real
+            svc.jwks_store.refresh()
+            svc.ban_cache.reload(force=True)
+            self._ticketing = svc
+        return self._ticketing
+
+    @property
+    def notifications(self):
+        if self._notifications is None:
+            svc = load_service('notification-service', **self.keycloak.env())
+            with svc.app.app_context():
+                svc.counter = StatementCounter(svc.db.engine)
+            self._notifications = svc
+        return self._notifications
+
+    def bearer(self, sub, *roles):
+        return {'Authorization': f"Bearer {self.keycloak.mint(sub, roles or ('USER',))}"}
+
+
+def run_requests(svc, work, send, workers):
+    """
+    Trimite send(client, item) pentru fiecare item, pe `workers` thread-uri,
+    fiecare cu propriul test client. Întoarce (latențe ms, statusuri, secunde).
+    """
+    latencies, statuses = [], Counter()
+    lock = threading.Lock()
+    local = threading.local()
+
+    def one(item):
+        if not hasattr(local, 'client'):
+            local.client = svc.app.test_client()
+        with svc.counter.measuring():
+            start = time.perf_counter()
+            status = send(local.client, item)
+            elapsed = (time.perf_counter() - start) * 1000
+        with lock:
+            latencies.append(elapsed)
+            statuses[status] += 1
+
+    svc.counter.reset()
+    svc.sql_profiler.reset()
+    with Timer() as t, ThreadPoolExecutor(workers) as pool:
+        list(pool.map(one, work))
+    return latencies, statuses, t.elapsed
+
+
+def over_budget(routes, budgets):
+    """Rutele care au depășit bugetul de instrucțiuni SQL, cu cel mai mare număr văzut."""
+    return {
+        route: stats['max_queries'] for route, stats in routes.items()
+        if route in budgets and stats['max_queries'] > budgets[route]
+    }
+
+
+def summarize(svc, latencies, statuses, elapsed, budgets=QUERY_BUDGETS, **extra):
+    requests = len(latencies)
+    routes = svc.sql_profiler.route_stats()
+    exceeded = over_budget(routes, budgets)
+    if exceeded:
+        extra['ok'] = False
+    return {
+        'requests': requests,
+        'elapsed_s': round(elapsed, 3),
+        'rps': round(requests / elapsed, 1) if elapsed else 0.0,
+        'p50_ms': round(percentile(latencies, 50), 3),
+        'p99_ms': round(percentile(latencies, 99), 3),
+        'queries_per_request': round(svc.counter.request / requests, 2) if requests else 0.0,
+        'background_queries': svc.counter.background,
+        'statuses': {str(status): count for status, count in sorted(statuses.items())},
+        'queries_by_route': routes,
+        'over_budget': exceeded,
+        **extra,
+    }
+
+
+def wait_until(predicate, timeout):
+    deadline = time.monotonic() + timeout
+    while not predicate() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return predicate()
+
+
+def scenario_onsale(bench):
+    args, svc = bench.args, bench.ticketing
+    with svc.app.app_context():
+        event = svc.Event(name='On-sale', starts_at=datetime(2030, 1, 1), total_tickets=args.capacity,
+                          inventory_shards=args.shards)
+        if args.shards:
+            event.shards = [svc.InventoryShard(shard_no=i, capacity=c, sold=0)
+                            for i, c in enumerate(svc.split_capacity(args.capacity, args.shards))]
+        svc.db.session.add(event)
+        svc.db.session.commit()
+        event_id = event.id
+
+    # fiecare cumpărător are propriul token: prima cerere plătește verificarea RSA, ca în realitate
+    buyers = [bench.bearer(f'buyer-{i}') for i in range(args.buyers)]
+    delivered_before = bench.broker.depth('ticket_booked')
+
+    def buy(client, headers):
+        return client.post(f'/events/{event_id}/tickets', headers=headers).status_code
+
+    latencies, statuses, elapsed = run_requests(svc, buyers, buy, args.workers)
+
+    with svc.app.app_context():
+        sold = svc.db.session.get(svc.Event, event_id).sold_count()
+    expected = min(args.capacity, args.buyers)
+    published = wait_until(lambda: bench.broker.depth('ticket_booked') - delivered_before >= expected, 30)
+    ok = sold == statuses[201] == expected and statuses[400] == args.buyers - expected and published
+    budgets = dict(QUERY_BUDGETS)
+    if args.shards:
+        budgets['POST /events/<int:event_id>/tickets'] = SHARDED_PURCHASE_BUDGET
+    return summarize(svc, latencies, statuses, elapsed, budgets=budgets, ok=ok, sold=sold,
+                     notifications_published=bench.broker.depth('ticket_booked') - delivered_before)
+
+
+def scenario_scan(bench):
+    args, svc = bench.args, bench.ticketing
+    with svc.app.app_context():
+        event = svc.Event(name='Doors', starts_at=datetime(2030, 1, 1), total_tickets=args.tickets)
+        svc.db.session.add(event)
+        svc.db.session.flush()
+        codes = list({svc.new_code(event.id) for _ in range(args.tickets)})
+        svc.db.session.execute(svc.insert(svc.Ticket), [
+            {'event_id': event.id, 'keycloak_sub': f'holder-{i}', 'code': code, 'purchased_at': datetime.utcnow()}
+            for i, code in enumerate(codes)
+        ])
+        svc.db.session.commit()
+        event_id = event.id
+
+    gates = [bench.bearer(f'gate-{g}', 'STAFF') for g in range(args.workers)]
+    # fiecare bilet o dată, plus reluări (oameni care scanează de două ori) și coduri străine
+    repeats = bench.rng.sample(codes, len(codes) // 10)
+    unknown = [svc.new_code(event_id) for _ in range(len(codes) // 50)]
+    scans = codes + repeats + unknown
+    bench.rng.shuffle(scans)
+    work = [(code, gates[i % len(gates)]) for i, code in enumerate(scans)]
+
+    def scan(client, item):
+        code, headers = item
+        return client.post(f'/scan/{code}', headers=headers).status_code
+
+    latencies, statuses, elapsed = run_requests(svc, work, scan, args.workers)
+    with svc.app.app_context():
+        used = svc.Ticket.query.filter(svc.Ticket.event_id == event_id, svc.Ticket.used_at.isnot(None)).count()
+    ok = (statuses[200] == used == len(codes) and statuses[400] == len(repeats)
+          and statuses[404] == len(unknown))
+    return summarize(svc, latencies, statuses, elapsed, ok=ok, used=used)
+
+
+def scenario_browse(bench):
+    args, svc = bench.args, bench.ticketing
+    with svc.app.app_context():
+        events = [
+            svc.Event(name=f'Concert {i}', location=f'Hall {i % 7}', starts_at=datetime(2030, 1, 1 + i % 28),
+                      total_tickets=1000, created_by='organizer')
+            for i in range(args.events)
+        ]
+        svc.db.session.add_all(events)
+        svc.db.session.commit()
+        event_ids = [e.id for e in events]
+
+    # cursoarele paginilor și ETag-urile se iau înainte de măsurare, ca un client care a mai fost pe site
+    client = svc.app.test_client()
+    cursors, cursor = [None], None
+    while True:
+        response = client.get('/events' + (f'?cursor={cursor}' if cursor else ''))
+        cursor = response.headers.get('X-Next-Cursor')
+        if not cursor:
+            break
+        cursors.append(cursor)
+    etags = {event_id: client.get(f'/events/{event_id}').headers.get('ETag') for event_id in event_ids[:50]}
+
+    work = []
+    for _ in range(args.browse_requests):
+        roll = bench.rng.random()
+        if roll < 0.5:
+            work.append(('list', bench.rng.choice(cursors)))
+        elif roll < 0.9:
+            work.append(('detail', bench.rng.choice(event_ids)))
+        else:
+            work.append(('revalidate', bench.rng.choice(list(etags))))
+
+    def browse(client, item):
+        kind, value = item
+        if kind == 'list':
+            return client.get('/events' + (f'?cursor={value}' if value else '')).status_code
+        if kind == 'detail':
+            return client.get(f'/events/{value}').status_code
+        return client.get(f'/events/{value}', headers={'If-None-Match': etags[value]}).status_code
+
+    latencies, statuses, elapsed = run_requests(svc, work, browse, args.workers)
+    ok = set(statuses) <= {200, 304}
+    return summarize(svc, latencies, statuses, elapsed, ok=ok, pages=len(cursors),
+                     response_cache=svc.response_cache.stats())
+
+
+def scenario_notifications(bench):
+    args, svc = bench.args, bench.notifications
+    broker = InProcessBroker()
+    messages = []
+    for i in range(args.messages):
+        codes = [f'{i:06x}-{n}' for n in range(bench.rng.randint(1, 4))]
+        messages.append(json.dumps({
+            'event_id': 1 + i % 20,
+            'organizer_sub': f'organizer-{i % 5}',
+            'buyer_sub': f'buyer-{i}',
+            'code': codes[0],
+            'codes': codes,
+            'created_at': datetime.utcnow().isoformat(),
+        }).encode('utf-8'))
+
+    svc.counter.reset()
+    with Timer() as t:
+        for body in messages:
+            broker.publish('ticket_booked', body)
+        threading.Thread(target=svc.consume_from_rabbitmq, args=(broker.connect,), daemon=True).start()
+        drained = wait_until(lambda: broker.acked >= len(messages), 120)
+    # oprim consumer-ul: reîncearcă la nesfârșit, dar fără broker nu mai face nimic
+    broker.down = True
+    queries = svc.counter.background
+
+    with svc.app.app_context():
+        saved = svc.Notification.query.count()
+    expected = sum(len(json.loads(body)['codes']) for body in messages)
+    handled = broker.handle_ms
+    return {
+        'requests': len(handled),
+        'elapsed_s': round(t.elapsed, 3),
+        'rps': round(len(handled) / t.elapsed, 1),
+        'p50_ms': round(percentile(handled, 50), 3),
+        'p99_ms': round(percentile(handled, 99), 3),
+        # aici totul rulează pe thread-ul consumer-ului: instrucțiuni SQL per mesaj
+        'queries_per_request': round(queries / len(handled), 2) if handled else 0.0,
+        'background_queries': 0,
+        'ok': drained and saved == expected,
+        'notifications_saved': saved,
+    }
+
+
+def git_revision():
+    try:
+        revision = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True,
+                                  text=True, check=True).stdout.strip()
+        dirty = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], cwd=ROOT,
+                               capture_output=True, text=True, check=True).stdout.strip()
+        return revision + ('-dirty' if dirty else '')
+    except Exception:
+        return None
+
+
+def compare(results, baseline, threshold):
+    """Tabel cu diferențele față de un JSON anterior; marchează regresiile peste `threshold` %."""
+    print(f"\ncompared with {baseline['meta'].get('revision')} ({baseline['meta'].get('created_at')})")
+    regressions = 0
+    for name, current in results['scenarios'].items():
+        before = baseline['scenarios'].get(name)
+        if not before:
+            continue
+        for metric, higher_is_better in COMPARED_METRICS.items():
+            old, new = before.get(metric), current.get(metric)
+            if not old or new is None:
+                continue
+            change = (new - old) / old * 100
+            worse = -change if higher_is_better else change
+            flag = '  REGRESSION' if worse > threshold else ''
+            regressions += bool(flag)
+            print(f"{name:<14} {metric:<20} {old:>10} -> {new:<10} {change:+7.1f}%{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scenarios', default=','.join(SCENARIOS))
+    parser.add_argument('--quick', action='store_true', help='dimensiuni mici, pentru o verificare rapidă')
+    parser.add_argument('--workers', type=int, default=16)
+    parser.add_argument('--buyers', type=int, default=2000)
+    parser.add_argument('--capacity', type=int, default=500)
+    parser.add_argument('--shards', type=int, default=0, help='inventory_shards pentru evenimentul din onsale')
+    parser.add_argument('--tickets', type=int, default=3000, help='bilete scanate în scan')
+    parser.add_argument('--events', type=int, default=500, help='evenimente în catalog pentru browse')
+    parser.add_argument('--browse-requests', type=int, default=5000)
+    parser.add_argument('--messages', type=int, default=2000, help='mesaje ticket_booked pentru notifications')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', help='scrie rezultatele în acest fișier JSON')
+    parser.add_argument('--compare', help='JSON-ul unei rulări anterioare')
+    parser.add_argument('--threshold', type=float, default=10.0, help='procent peste care o diferență e regresie')
+    args = parser.parse_args()
+    if args.quick:
+        args.buyers, args.capacity, args.tickets = 300, 100, 500
+        args.events, args.browse_requests, args.messages = 120, 1000, 300
+
+    names = [name.strip() for name in args.scenarios.split(',') if name.strip()]
+    unknown = set(names) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+
+    bench = Bench(args)
+    results = {
+        'meta': {
+            'revision': git_revision(),
+            'created_at': datetime.utcnow().isoformat(timespec='seconds'),
+            'database': sqlalchemy.engine.make_url(os.getenv('BENCH_DATABASE_URL', 'sqlite://')).get_backend_name(),
+            'python': platform.python_version(),
+            'sqlalchemy': sqlalchemy.__version__,
+            'cpus': os.cpu_count(),
+            'params': {k: v for k, v in vars(args).items() if k not in ('output', 'compare', 'scenarios')},
+        },
+        'scenarios': {},
+    }
+
+    scenarios = {'onsale': scenario_onsale, 'scan': scenario_scan, 'browse': scenario_browse,
+                 'notifications': scenario_notifications}
+    for name in names:
+        # generator propriu per scenariu: aceleași date și când se rulează doar o parte din scenarii
+        bench.rng = random.Random(f'{args.seed}:{name}')
+        result = results['scenarios'][name] = scenarios[name](bench)
+        print(f"{name:<14} requests={result['requests']:<6} rps={result['rps']:<8} p50={result['p50_ms']:.2f}ms "
+              f"p99={result['p99_ms']:.2f}ms queries/req={result['queries_per_request']:<5} "
+              f"{'OK' if result['ok'] else 'FAIL'}")
+        for route, queries in result.get('over_budget', {}).items():
+            print(f"{'':<14} over query budget: {route} ran {queries} statements in one request")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+        print(f"results written to {args.output}")
+    if args.compare:
+        with open(args.compare) as f:
+            compare(results, json.load(f), args.threshold)
+
+    return 0 if all(r['ok'] for r in results['scenarios'].values()) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,294 @@
+"""
+Înlocuitori locali pentru dependențele externe ale serviciilor, ca
+benchmark-urile să ruleze fără Docker: un Keycloak minimal (JWKS + token-uri
+RS256), un broker AMQP în proces și un store de contoare compatibil cu
+subsetul redis-py folosit de servicii.
+"""
+import json
+import threading
+import time
+from collections import defaultdict, deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+
+import jwt
+from cryptography.hazmat.primitives.asymmetric import rsa
+from pika.exceptions import AMQPConnectionError, ConnectionClosed
+
+
+class LocalKeycloak:
+    """
+    Servește JWKS pe 127.0.0.1, la același path ca Keycloak, și emite
+    token-uri RS256 semnate cu cheia lui: verify_token parcurge calea reală
+    (fetch JWKS, verificare RSA, apoi cache-ul de token-uri).
+    Serviciul trebuie încărcat cu env() (KEYCLOAK_URL etc.).
+    """
+
+    def __init__(self, realm='eventflow', kid='bench-key'):
+        self.realm = realm
+        self.kid = kid
+        self.jwks_requests = 0
+        self._key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        jwk = json.loads(jwt.algorithms.RSAAlgorithm.to_jwk(self._key.public_key()))
+        jwk.update(kid=kid, use='sig', alg='RS256')
+        jwks = json.dumps({'keys': [jwk]}).encode('utf-8')
+        certs_path = f'/realms/{realm}/protocol/openid-connect/certs'
+        keycloak = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path != certs_path:
+                    self.send_error(404)
+                    return
+                keycloak.jwks_requests += 1
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(jwks)))
+                self.end_headers()
+                self.wfile.write(jwks)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, name='local-keycloak', daemon=True).start()
+        self.url = f'http://127.0.0.1:{self._server.server_port}'
+
+    def env(self):
+        return {'KEYCLOAK_URL': self.url, 'KEYCLOAK_PUBLIC_URL': self.url, 'KEYCLOAK_REALM': self.realm}
+
+    def mint(self, sub, roles=('USER',), ttl=3600):
+        now = int(time.time())
+        claims = {
+            'sub': sub,
+            'iss': f'{self.url}/realms/{self.realm}',
+            'iat': now,
+            'exp': now + ttl,
+            'preferred_username': sub,
+            'realm_access': {'roles': list(roles)},
+        }
+        return jwt.encode(claims, self._key, algorithm='RS256', headers={'kid': self.kid})
+
+    def close(self):
+        self._server.shutdown()
+
+
+class InProcessBroker:
+    """
+    Broker AMQP minimal: cozi în memorie, publisher confirms și tranzacții
+    (tx_select / tx_commit), posibilitatea de a simula o pană (`down = True`)
+    și un round trip (`rtt`, secunde) pentru fiecare operație care așteaptă
+    răspunsul broker-ului; `round_trips` le numără.
+    Expune aceeași interfață ca pika.BlockingConnection cât folosesc serviciile,
+    inclusiv consumul (basic_consume / start_consuming / basic_ack).
+    """
+
+    def __init__(self):
+        self.queues = defaultdict(deque)
+        self.lock = threading.Condition()
+        self.down = False
+        self.rtt = 0.0
+        self.round_trips = 0
+        self.connections = 0
+        self.acked = 0
+        self.handle_ms = []  # cât a durat callback-ul consumer-ului pentru fiecare mesaj
+
+    def connect(self):
+        if self.down:
+            raise AMQPConnectionError('in-process broker is down')
+        with self.lock:
+            self.connections += 1
+        return _Connection(self)
+
+    def publish(self, queue, body):
+        with self.lock:
+            self.queues[queue].append(body)
+            self.lock.notify_all()
+
+    def round_trip(self):
+        with self.lock:
+            self.round_trips += 1
+        if self.rtt:
+            time.sleep(self.rtt)
+
+    def messages(self, queue):
+        with self.lock:
+            return list(self.queues[queue])
+
+    def depth(self, queue):
+        with self.lock:
+            return len(self.queues[queue])
+
+
+class _Connection:
+    def __init__(self, broker):
+        self.broker = broker
+        self.is_open = True
+
+    def channel(self):
+        return _Channel(self)
+
+    def process_data_events(self, time_limit=0):
+        if self.broker.down:
+            self.is_open = False
+            raise AMQPConnectionError('in-process broker is down')
+
+    def close(self):
+        self.is_open = False
+
+
+class _Channel:
+    def __init__(self, connection):
+        self.connection = connection
+        self.broker = connection.broker
+        self.confirms = False
+        self._tx = None  # mesajele necomise, cu tx_select
+        self._consumers = []
+        self._delivery_tags = 0
+
+    @property
+    def is_open(self):
+        return self.connection.is_open
+
+    def _check(self):
+        if self.broker.down or not self.connection.is_open:
+            self.connection.close()
+            raise ConnectionClosed(320, 'in-process broker connection closed')
+
+    def queue_declare(self, queue, durable=False, passive=False):
+        self._check()
+        with self.broker.lock:
+            self.broker.queues[queue]
+
+    def confirm_delivery(self):
+        self.confirms = True
+
+    def tx_select(self):
+        self._check()
+        self.broker.round_trip()
+        self._tx = []
+
+    def tx_commit(self):
+        self._check()
+        self.broker.round_trip()
+        for routing_key, body in self._tx:
+            self.broker.publish(routing_key, body)
+        self._tx = []
+
+    def basic_publish(self, exchange, routing_key, body, properties=None, mandatory=False):
+        self._check()
+        if self._tx is not None:
+            # ca în AMQP: nu se așteaptă nimic, mesajul ajunge în coadă la commit
+            self._tx.append((routing_key, body))
+            return
+        if self.confirms:
+            # BlockingChannel cu confirm_delivery așteaptă ack-ul fiecărui mesaj
+            self.broker.round_trip()
+        self.broker.publish(routing_key, body)
+
+    def basic_qos(self, prefetch_count=0):
+        pass
+
+    def basic_consume(self, queue, on_message_callback, auto_ack=False):
+        self._consumers.append((queue, on_message_callback))
+
+    def start_consuming(self):
+        """Ca în pika: livrează mesaje în thread-ul curent până se închide conexiunea."""
+        while True:
+            self._check()
+            delivery = None
+            with self.broker.lock:
+                for queue, callback in self._consumers:
+                    if self.broker.queues[queue]:
+                        delivery = callback, self.broker.queues[queue].popleft()
+                        break
+                else:
+                    self.broker.lock.wait(0.05)
+            if delivery is not None:
+                callback, body = delivery
+                self._delivery_tags += 1
+                start = time.perf_counter()
+                callback(self, SimpleNamespace(delivery_tag=self._delivery_tags), None, body)
+                self.broker.handle_ms.append((time.perf_counter() - start) * 1000)
+
+    def basic_ack(self, delivery_tag):
+        with self.broker.lock:
+            self.broker.acked += 1
+
+
+class LocalCounterStore:
+    """
+    Store de contoare în proces, cu operații atomice și expirare, care imită
+    subsetul redis-py folosit de servicii (incr, decr, get, set, expire, pipeline).
+    Mai multe "replici" din același benchmark pot împărți aceeași instanță.
+    """
+
+    def __init__(self):
+        self._data = {}
+        self._expires = {}
+        self._lock = threading.Lock()
+        self.commands = 0
+
+    def _alive(self, key):
+        expires = self._expires.get(key)
+        if expires is not None and expires <= time.time():
+            self._data.pop(key, None)
+            self._expires.pop(key, None)
+        return key in self._data
+
+    def incr(self, key, amount=1):
+        with self._lock:
+            self.commands += 1
+            value = int(self._data[key]) + amount if self._alive(key) else amount
+            self._data[key] = value
+            return value
+
+    def decr(self, key, amount=1):
+        return self.incr(key, -amount)
+
+    def get(self, key):
+        with self._lock:
+            self.commands += 1
+            return str(self._data[key]).encode() if self._alive(key) else None
+
+    def set(self, key, value, nx=False, ex=None):
+        with self._lock:
+            self.commands += 1
+            if nx and self._alive(key):
+                return None
+            self._data[key] = value
+            if ex is not None:
+                self._expires[key] = time.time() + ex
+            return True
+
+    def expire(self, key, seconds):
+        with self._lock:
+            self.commands += 1
+            if not self._alive(key):
+                return False
+            self._expires[key] = time.time() + seconds
+            return True
+
+    def pipeline(self, transaction=False):
+        return _Pipeline(self)
+
+    def __len__(self):
+        with self._lock:
+            return sum(1 for key in list(self._data) if self._alive(key))
+
+
+class _Pipeline:
+    def __init__(self, store):
+        self.store = store
+        self.calls = []
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self.calls.append((name, args, kwargs))
+            return self
+        return queue
+
+    def execute(self):
+        calls, self.calls = self.calls, []
+        return [getattr(self.store, name)(*args, **kwargs) for name, args, kwargs in calls]
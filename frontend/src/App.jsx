@@ -39,9 +39,11 @@ export default function App() {
   );
   const [events, setEvents] = useState([]);
   const [loadingEvents, setLoadingEvents] = useState(false);
+  const [eventsCursor, setEventsCursor] = useState(null);
   const [createResult, setCreateResult] = useState('');
   const [myTicketsText, setMyTicketsText] = useState('');
   const [myTicketsList, setMyTicketsList] = useState([]);
+  const [myTicketsCursor, setMyTicketsCursor] = useState(null);
 
   const [evName, setEvName] = useState('');
   const [evLocation, setEvLocation] = useState('');
@@ -51,11 +53,31 @@ export default function App() {
   const [scanCode, setScanCode] = useState('');
   const [scanResult, setScanResult] = useState('');
   const [notifications, setNotifications] = useState('');
+  const [liveStock, setLiveStock] = useState(false);
 
   useEffect(() => {
     loadEvents();
   }, []);
 
+  // stocul rămas vine live prin SSE doar la cerere: fiecare conexiune ține
+  // ocupat un thread din ticketing-service (vezi INVENTORY_STREAM_MAX_CONNECTIONS)
+  const streamedIds = liveStock ? events.map(ev => ev.id).slice(0, 100).join(',') : '';
+  useEffect(() => {
+    if (!streamedIds) return undefined;
+    const source = new EventSource(`${API_BASE}/events/stream?events=${streamedIds}`);
+    source.addEventListener('inventory', msg => {
+      const remaining = new Map(JSON.parse(msg.data));
+      setEvents(prev =>
+        prev.map(ev => {
+          if (!remaining.has(ev.id) || remaining.get(ev.id) === null) return ev;
+          const left = remaining.get(ev.id);
+          return { ...ev, remaining_tickets: left, tickets_sold: ev.total_tickets - left };
+        })
+      );
+    });
+    return () => source.close();
+  }, [streamedIds]);
+
   function handleSaveToken() {
     setStoredToken(token);
     const info = decodeToken(token);
@@ -67,14 +89,17 @@ export default function App() {
     }
   }
 
-  async function loadEvents() {
+  async function loadEvents(cursor = null) {
     setLoadingEvents(true);
     try {
-      const res = await fetch(`${API_BASE}/events`);
+      const query = cursor ? `?cursor=${encodeURIComponent(cursor)}` : '';
+      const res = await fetch(`${API_BASE}/events${query}`);
       const data = await res.json();
+      // lista e paginată: cursorul pentru pagina următoare vine în header
+      setEventsCursor(res.headers.get('X-Next-Cursor'));
       if (Array.isArray(data)) {
-        setEvents(data);
-      } else {
+        setEvents(prev => (cursor ? [...prev, ...data] : data));
+      } else if (!cursor) {
         setEvents([]);
       }
     } catch (e) {
@@ -138,25 +163,29 @@ export default function App() {
     }
   }
 
-  async function loadMyTickets() {
+  async function loadMyTickets(cursor = null) {
     if (!token) {
       setMyTicketsText('Please paste your token first.');
       setMyTicketsList([]);
       return;
     }
     setMyTicketsText('Loading...');
-    setMyTicketsList([]);
+    if (!cursor) {
+      setMyTicketsList([]);
+    }
     try {
-      const res = await fetch(`${API_BASE}/my-tickets`, {
+      const query = cursor ? `?cursor=${encodeURIComponent(cursor)}` : '';
+      const res = await fetch(`${API_BASE}/my-tickets${query}`, {
         headers: {
           Authorization: `Bearer ${token}`,
         },
       });
       const data = await res.json();
       setMyTicketsText(JSON.stringify(data, null, 2));
+      setMyTicketsCursor(res.headers.get('X-Next-Cursor'));
       if (Array.isArray(data)) {
-        setMyTicketsList(data);
-      } else {
+        setMyTicketsList(prev => (cursor ? [...prev, ...data] : data));
+      } else if (!cursor) {
         setMyTicketsList([]);
       }
     } catch (e) {
@@ -252,9 +281,12 @@ export default function App() {
         <div style={{ flex: '1 1 280px' }}>
           <div style={cardStyle}>
             <h2>2. Evenimente</h2>
-            <button style={secondaryButtonStyle} onClick={loadEvents} disabled={loadingEvents}>
+            <button style={secondaryButtonStyle} onClick={() => loadEvents()} disabled={loadingEvents}>
               {loadingEvents ? 'Loading...' : 'Refresh events'}
             </button>
+            <label style={{ marginLeft: '0.75rem' }}>
+              <input type="checkbox" checked={liveStock} onChange={e => setLiveStock(e.target.checked)} /> Stoc live
+            </label>
             <div style={{ marginTop: '0.75rem' }}>
               {events.length === 0 && !loadingEvents && <p>No events yet.</p>}
               {events.map(ev => (
@@ -272,6 +304,11 @@ export default function App() {
                   </button>
                 </div>
               ))}
+              {eventsCursor && (
+                <button style={secondaryButtonStyle} onClick={() => loadEvents(eventsCursor)} disabled={loadingEvents}>
+                  Load more
+                </button>
+              )}
             </div>
           </div>
         </div>
@@ -325,7 +362,7 @@ export default function App() {
 
           <div style={cardStyle}>
             <h2>4. Biletele mele</h2>
-            <button style={secondaryButtonStyle} onClick={loadMyTickets}>Load my tickets</button>
+            <button style={secondaryButtonStyle} onClick={() => loadMyTickets()}>Load my tickets</button>
             <div style={{ marginTop: '0.75rem' }}>
               {myTicketsList.map(t => (
                 <div key={t.id} style={ticketCardStyle}>
@@ -338,6 +375,11 @@ export default function App() {
                   </div>
                 </div>
               ))}
+              {myTicketsCursor && (
+                <button style={secondaryButtonStyle} onClick={() => loadMyTickets(myTicketsCursor)}>
+                  Load more
+                </button>
+              )}
             </div>
             <pre style={preStyle}>{myTicketsText}</pre>
           </div>
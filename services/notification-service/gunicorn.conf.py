@@ -0,0 +1,49 @@
+"""
+Configurație gunicorn pentru notification-service (CMD din Dockerfile;
+gunicorn citește automat gunicorn.conf.py din directorul curent).
+
+Aplicația se încarcă o dată în master, care creează tabelele (on_starting);
+fiecare worker își deschide apoi propriul pool de conexiuni și propriul
+consumer RabbitMQ (init_worker), deci mesajele se împart între worker-e.
+Un mesaj e confirmat abia după commit, așa că la oprire (SIGTERM) cele
+neconfirmate sunt livrate din nou altui consumer.
+Metricile Prometheus ale worker-elor se adună în PROMETHEUS_MULTIPROC_DIR.
+"""
+import os
+import shutil
+
+
+# Trebuie setat înainte ca aplicația (preload_app) să importe prometheus_client
+os.environ.setdefault('PROMETHEUS_MULTIPROC_DIR', '/tmp/prometheus-metrics')
+shutil.rmtree(os.environ['PROMETHEUS_MULTIPROC_DIR'], ignore_errors=True)
+os.makedirs(os.environ['PROMETHEUS_MULTIPROC_DIR'], exist_ok=True)
+
+
+bind = f"0.0.0.0:{os.getenv('PORT', 3006)}"
+workers = int(os.getenv('WEB_CONCURRENCY', 2))
+worker_class = os.getenv('GUNICORN_WORKER_CLASS', 'gthread')
+threads = int(os.getenv('GUNICORN_THREADS', 8))
+timeout = int(os.getenv('GUNICORN_TIMEOUT', 30))
+graceful_timeout = int(os.getenv('GUNICORN_GRACEFUL_TIMEOUT', 25))
+keepalive = int(os.getenv('GUNICORN_KEEPALIVE', 5))
+# Reciclează worker-ele după N cereri (0 = niciodată), decalat ca să nu repornească toate odată
+max_requests = int(os.getenv('GUNICORN_MAX_REQUESTS', 0))
+max_requests_jitter = int(os.getenv('GUNICORN_MAX_REQUESTS_JITTER', 50))
+preload_app = os.getenv('GUNICORN_PRELOAD', 'true').lower() == 'true'
+wsgi_app = 'app:app'
+accesslog = '-' if os.getenv('GUNICORN_ACCESS_LOG', 'false').lower() == 'true' else None
+
+
+def on_starting(server):
+    from app import init_db
+    init_db()
+
+
+def post_worker_init(worker):
+    from app import init_worker
+    init_worker()
+
+
+def child_exit(server, worker):
+    from prometheus_client import multiprocess
+    multiprocess.mark_process_dead(worker.pid)
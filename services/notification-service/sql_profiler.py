@@ -0,0 +1,113 @@
+"""
+Profilarea instrucțiunilor SQL per cerere, pornită cu SQL_PROFILING=true.
+
+Același fișier este copiat în fiecare serviciu (ticketing, user-profile,
+notification), ca metrics.py.
+
+Pentru fiecare cerere se numără instrucțiunile și timpul lor în baza de date:
+- răspunsul primește header-ele X-Query-Count și X-Query-Time-Ms;
+- aceeași formă de instrucțiune (SQL-ul cu parametrii și listele IN (...)
+  reduse la ?) repetată de cel puțin SQL_N_PLUS_ONE_THRESHOLD ori într-o
+  cerere e logată ca probabil N+1 (de obicei o relație lazy, ex. Ticket.event
+  în to_dict, încărcată rând cu rând);
+- instrucțiunile mai lente de SQL_SLOW_QUERY_MS sunt logate cu ruta care le-a
+  trimis (sau numele thread-ului, pentru cele din background).
+
+route_stats() adună pe rută cel mai mare număr de instrucțiuni dintr-o cerere;
+benchmarks/run.py îl folosește ca să verifice bugetele de interogări.
+Oprit (implicit), modulul nu atașează nimic la engine.
+"""
+import os
+import re
+import threading
+import time
+from collections import Counter
+
+from flask import g, has_request_context, request
+from sqlalchemy import event as sa_event
+
+
+SQL_PROFILING = os.getenv('SQL_PROFILING', 'false').lower() == 'true'
+SQL_SLOW_QUERY_MS = float(os.getenv('SQL_SLOW_QUERY_MS', 100))
+SQL_N_PLUS_ONE_THRESHOLD = int(os.getenv('SQL_N_PLUS_ONE_THRESHOLD', 5))
+
+# ? (sqlite), %(nume)s / %s (psycopg2), :nume, $1
+_PLACEHOLDER = re.compile(r"%\(\w+\)s|%s|\$\d+|(?<!:):\w+|\?")
+_PLACEHOLDER_LIST = re.compile(r"\?(?:\s*,\s*\?)+")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def statement_shape(statement):
+    """Forma unei instrucțiuni: aceeași pentru IN (?, ?) și IN (?, ?, ?)."""
+    shape = _PLACEHOLDER.sub('?', _WHITESPACE.sub(' ', statement).strip())
+    return _PLACEHOLDER_LIST.sub('?', shape)
+
+
+def _route():
+    if request.url_rule is None:
+        return f'{request.method} unmatched'
+    return f'{request.method} {request.url_rule.rule}'
+
+
+class SQLProfiler:
+    def __init__(self, app, db, slow_query_ms=SQL_SLOW_QUERY_MS, n_plus_one_threshold=SQL_N_PLUS_ONE_THRESHOLD):
+        self.slow_query_ms = slow_query_ms
+        self.n_plus_one_threshold = n_plus_one_threshold
+        self._lock = threading.Lock()
+        self._routes = {}
+
+        app.before_request(self._before_request)
+        app.after_request(self._after_request)
+        with app.app_context():
+            engine = db.engine
+        sa_event.listen(engine, 'before_cursor_execute', self._before_cursor_execute)
+        sa_event.listen(engine, 'after_cursor_execute', self._after_cursor_execute)
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        context.profiler_started = time.perf_counter()
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        started = getattr(context, 'profiler_started', None)
+        if started is None:
+            return
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        in_request = has_request_context() and 'sql_statements' in g
+
+        if elapsed_ms >= self.slow_query_ms:
+            origin = _route() if in_request else f'thread {threading.current_thread().name}'
+            print(f"Slow query ({elapsed_ms:.1f} ms) from {origin}: {_WHITESPACE.sub(' ', statement)[:500]}")
+        if in_request:
+            g.sql_statements[statement_shape(statement)] += 1
+            g.sql_time_ms += elapsed_ms
+
+    def _before_request(self):
+        g.sql_statements = Counter()
+        g.sql_time_ms = 0.0
+
+    def _after_request(self, response):
+        statements = g.pop('sql_statements', None)
+        if statements is None:
+            return response
+        count = sum(statements.values())
+        elapsed_ms = g.pop('sql_time_ms', 0.0)
+        response.headers['X-Query-Count'] = str(count)
+        response.headers['X-Query-Time-Ms'] = f'{elapsed_ms:.2f}'
+
+        route = _route()
+        repeated = [(shape, n) for shape, n in statements.items() if n >= self.n_plus_one_threshold]
+        for shape, n in repeated:
+            print(f"Possible N+1 in {route}: {n}x {shape[:300]}")
+        with self._lock:
+            stats = self._routes.setdefault(route, {'requests': 0, 'max_queries': 0, 'n_plus_one': 0})
+            stats['requests'] += 1
+            stats['max_queries'] = max(stats['max_queries'], count)
+            stats['n_plus_one'] += bool(repeated)
+        return response
+
+    def route_stats(self):
+        with self._lock:
+            return {route: dict(stats) for route, stats in self._routes.items()}
+
+    def reset(self):
+        with self._lock:
+            self._routes.clear()
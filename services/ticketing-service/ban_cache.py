@@ -0,0 +1,62 @@
+"""
+Lista de utilizatori banați ținută în memorie de fiecare worker.
+
+Lista e mică și se schimbă rar, deci o încărcăm întreagă: la pornire, când
+ban_user / unban_user fac commit (NOTIFY prin pg_listener) și periodic, ca
+plasă de siguranță dacă o notificare s-a pierdut.
+"""
+import os
+import threading
+import time
+
+
+BAN_CACHE_REFRESH_INTERVAL = float(os.getenv('BAN_CACHE_REFRESH_INTERVAL', 60))
+
+
+class BanListCache:
+    def __init__(self, app, loader, refresh_interval=BAN_CACHE_REFRESH_INTERVAL):
+        self.app = app
+        self.loader = loader
+        self.refresh_interval = refresh_interval
+
+        self._subs = frozenset()
+        self._loaded_at = None
+        self._stale = True
+        self._lock = threading.Lock()
+
+    def _expired(self):
+        # _loaded_at e None până se termină prima încărcare (chiar dacă _stale e deja False)
+        return (self._stale or self._loaded_at is None
+                or time.monotonic() - self._loaded_at >= self.refresh_interval)
+
+    def __contains__(self, sub):
+        if self._expired():
+            self.reload()
+        return sub in self._subs
+
+    def invalidate(self, payload=None):
+        self._stale = True
+
+    def reload(self, force=False):
+        with self._lock:
+            # Alt thread poate să fi reîncărcat lista cât am așteptat lock-ul
+            if not force and not self._expired():
+                return
+            # O invalidare care sosește în timpul încărcării marchează din nou lista ca veche
+            self._stale = False
+            try:
+                with self.app.app_context():
+                    subs = frozenset(self.loader())
+            except Exception as e:
+                if self._loaded_at is None:
+                    self._stale = True
+                    raise
+                # Păstrăm ultima listă bună și reîncercăm la următorul interval
+                print(f"Ban list refresh failed, keeping {len(self._subs)} cached entries: {e}")
+                self._loaded_at = time.monotonic()
+                return
+            self._subs = subs
+            self._loaded_at = time.monotonic()
+
+    def __len__(self):
+        return len(self._subs)
@@ -0,0 +1,71 @@
+"""
+Configurație gunicorn pentru ticketing-service (CMD din Dockerfile; gunicorn
+citește automat gunicorn.conf.py din directorul curent).
+
+- aplicația se încarcă o dată în master (preload_app), care creează tabelele
+  (on_starting); fiecare worker își deschide apoi propriul pool de conexiuni
+  și își pornește thread-urile de background (post_worker_init -> init_worker);
+- worker-ele sunt gevent (implicit): fiecare cerere, inclusiv o conexiune
+  /events/stream deschisă, e un greenlet, deci un worker ține mii de clienți
+  SSE (GUNICORN_WORKER_CONNECTIONS) fără să blocheze cumpărările. Patch-ul
+  gevent (și psycogreen pentru psycopg2) se face aici, înainte ca preload_app
+  să importe aplicația: lock-urile, Event-urile și thread-urile create la
+  import (hub-ul SSE, publisher-ul, listener-ul pg) trebuie să fie deja
+  cooperative. Un patch în post_fork ar veni după preload, prea târziu.
+  GUNICORN_WORKER_CLASS=gthread rămâne posibil, cu GUNICORN_THREADS
+  cereri în paralel și un thread ocupat de fiecare client SSE;
+- la SIGTERM (docker stack update / rm) master-ul nu mai acceptă conexiuni și
+  lasă cererile în curs să se termine cel mult GUNICORN_GRACEFUL_TIMEOUT
+  secunde; stop_grace_period din docker-stack.yml trebuie să fie mai mare;
+- metricile Prometheus ale worker-elor se scriu în PROMETHEUS_MULTIPROC_DIR
+  (golit la pornire), ca /metrics să întoarcă suma lor indiferent ce worker
+  răspunde; fișierele worker-elor oprite sunt marcate în child_exit.
+"""
+import os
+import shutil
+
+
+worker_class = os.getenv('GUNICORN_WORKER_CLASS', 'gevent')
+if worker_class == 'gevent':
+    from gevent import monkey
+    monkey.patch_all()
+    if os.getenv('DATABASE_URL', 'postgresql').startswith('postgresql'):
+        from psycogreen.gevent import patch_psycopg
+        patch_psycopg()
+    # o conexiune SSE e doar un greenlet în așteptare
+    os.environ.setdefault('INVENTORY_STREAM_MAX_CONNECTIONS', '5000')
+
+# Trebuie setat înainte ca aplicația (preload_app) să importe prometheus_client
+os.environ.setdefault('PROMETHEUS_MULTIPROC_DIR', '/tmp/prometheus-metrics')
+shutil.rmtree(os.environ['PROMETHEUS_MULTIPROC_DIR'], ignore_errors=True)
+os.makedirs(os.environ['PROMETHEUS_MULTIPROC_DIR'], exist_ok=True)
+
+
+bind = f"0.0.0.0:{os.getenv('PORT', 3005)}"
+workers = int(os.getenv('WEB_CONCURRENCY', 2))
+threads = int(os.getenv('GUNICORN_THREADS', 8))
+worker_connections = int(os.getenv('GUNICORN_WORKER_CONNECTIONS', 5000))
+timeout = int(os.getenv('GUNICORN_TIMEOUT', 30))
+graceful_timeout = int(os.getenv('GUNICORN_GRACEFUL_TIMEOUT', 25))
+keepalive = int(os.getenv('GUNICORN_KEEPALIVE', 5))
+# Reciclează worker-ele după N cereri (0 = niciodată), decalat ca să nu repornească toate odată
+max_requests = int(os.getenv('GUNICORN_MAX_REQUESTS', 0))
+max_requests_jitter = int(os.getenv('GUNICORN_MAX_REQUESTS_JITTER', 50))
+preload_app = os.getenv('GUNICORN_PRELOAD', 'true').lower() == 'true'
+wsgi_app = 'app:app'
+accesslog = '-' if os.getenv('GUNICORN_ACCESS_LOG', 'false').lower() == 'true' else None
+
+
+def on_starting(server):
+    from app import init_db
+    init_db()
+
+
+def post_worker_init(worker):
+    from app import init_worker
+    init_worker(workers=worker.cfg.workers)
+
+
+def child_exit(server, worker):
+    from prometheus_client import multiprocess
+    multiprocess.mark_process_dead(worker.pid)
@@ -0,0 +1,65 @@
+"""
+Sweeper pentru rezervările temporare de locuri (ticket_holds).
+
+O rezervare ia stocul pe loc și expiră după HOLD_TTL_SECONDS dacă nu e
+confirmată. Un thread per worker eliberează periodic rezervările expirate
+în loturi: `release(limit)` (din app.py) șterge un lot și dă stocul înapoi
+cu câte un singur UPDATE per tabelă, indiferent câte rezervări conține.
+
+Aceeași clasă curăță și cheile de idempotență expirate (vezi idempotency.py),
+cu alt `release` și alt interval.
+"""
+import os
+import threading
+
+
+HOLD_TTL_SECONDS = int(os.getenv('HOLD_TTL_SECONDS', 600))
+HOLD_SWEEP_INTERVAL = float(os.getenv('HOLD_SWEEP_INTERVAL', 5))
+HOLD_SWEEP_BATCH = int(os.getenv('HOLD_SWEEP_BATCH', 500))
+
+
+class HoldSweeper:
+    def __init__(self, app, release, batch_size=HOLD_SWEEP_BATCH, interval=HOLD_SWEEP_INTERVAL,
+                 name='hold-sweeper'):
+        self.app = app
+        self.release = release
+        self.batch_size = batch_size
+        self.interval = interval
+        self.name = name
+
+        self._wakeup = threading.Event()
+        self._worker_pid = None
+        self._lock = threading.Lock()
+
+        self.released = 0
+
+    def start(self):
+        pid = os.getpid()
+        if self._worker_pid == pid:
+            return
+        with self._lock:
+            if self._worker_pid == pid:
+                return
+            self._worker_pid = pid
+            threading.Thread(target=self._run, name=self.name, daemon=True).start()
+
+    def _run(self):
+        while True:
+            try:
+                # Cât timp găsim loturi pline, continuăm fără pauză
+                while self.sweep_once() >= self.batch_size:
+                    pass
+            except Exception as e:
+                print(f"{self.name} error: {e}")
+            self._wakeup.wait(self.interval)
+            self._wakeup.clear()
+
+    def sweep_once(self) -> int:
+        """Eliberează un lot de rezervări expirate; întoarce câte au fost eliberate."""
+        with self.app.app_context():
+            count = self.release(self.batch_size)
+        self.released += count
+        return count
+
+    def stats(self):
+        return {'released': self.released}
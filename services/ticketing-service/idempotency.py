@@ -0,0 +1,44 @@
+"""
+Chei de idempotență pentru cumpărări (header-ul Idempotency-Key).
+
+Clienții mobili reiau POST-ul de cumpărare la timeout. Cu o cheie, prima
+cerere care reușește salvează răspunsul (tabela idempotency_keys) în aceeași
+tranzacție cu biletele; reluările primesc răspunsul salvat, fără să atingă
+stocul sau limita de rate. Rândul cheii se inserează primul în tranzacție,
+deci un duplicat concurent așteaptă pe indexul unic până când prima cerere
+face commit (sau rollback, caz în care duplicatul cumpără el).
+
+Cheia e per utilizator; amprenta cererii (metodă, path, body) împiedică
+refolosirea ei pentru o altă cerere. Cheile expiră după IDEMPOTENCY_KEY_TTL
+și sunt șterse în loturi de un sweeper.
+"""
+import hashlib
+import os
+
+
+IDEMPOTENCY_KEY_TTL = int(os.getenv('IDEMPOTENCY_KEY_TTL', 86400))
+IDEMPOTENCY_SWEEP_INTERVAL = float(os.getenv('IDEMPOTENCY_SWEEP_INTERVAL', 300))
+IDEMPOTENCY_KEY_MAX_LENGTH = 255
+
+
+class InvalidIdempotencyKey(ValueError):
+    pass
+
+
+class DuplicateIdempotencyKey(Exception):
+    """O altă cerere cu aceeași cheie a făcut commit între verificare și tranzacția noastră."""
+
+
+def validate_key(raw: str) -> str:
+    key = raw.strip()
+    if not key or len(key) > IDEMPOTENCY_KEY_MAX_LENGTH or not key.isprintable():
+        raise InvalidIdempotencyKey(
+            f'Idempotency-Key trebuie să aibă între 1 și {IDEMPOTENCY_KEY_MAX_LENGTH} caractere afișabile'
+        )
+    return key
+
+
+def request_fingerprint(method: str, path: str, body: bytes) -> str:
+    digest = hashlib.sha256(f'{method} {path}\n'.encode('utf-8'))
+    digest.update(body or b'')
+    return digest.hexdigest()
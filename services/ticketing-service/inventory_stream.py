@@ -0,0 +1,166 @@
+"""
+Stream SSE cu stocul rămas al evenimentelor (GET /events/stream).
+
+Un singur hub per worker: un thread citește periodic stocul pentru toate
+evenimentele urmărite de clienții conectați, cu o singură interogare pe
+tick, și trimite fiecărui client doar perechile (event_id, remaining) care
+s-au schimbat. Tick-ul (1 / INVENTORY_STREAM_MAX_RATE secunde) limitează
+câte actualizări pe secundă primește un client pentru un eveniment;
+schimbările din același tick se comasează.
+
+O conexiune costă doar un dict cu modificările în așteptare și un Event pe
+care generatorul ei așteaptă; nu face nicio interogare proprie. Sub worker-ul
+gevent (implicit în gunicorn.conf.py) un singur proces ține mii de conexiuni;
+sub gthread fiecare ocupă un thread, deci numărul lor e limitat
+(INVENTORY_STREAM_MAX_CONNECTIONS).
+"""
+import json
+import os
+import threading
+import time
+
+
+INVENTORY_STREAM_MAX_RATE = float(os.getenv('INVENTORY_STREAM_MAX_RATE', 2))
+INVENTORY_STREAM_HEARTBEAT = float(os.getenv('INVENTORY_STREAM_HEARTBEAT', 15))
+INVENTORY_STREAM_MAX_EVENTS = int(os.getenv('INVENTORY_STREAM_MAX_EVENTS', 100))
+# Conexiuni per worker; peste limită stream-ul primește 503. Sub gevent
+# (implicit, gunicorn.conf.py o ridică la 5000) o conexiune e un greenlet;
+# cu gthread fiecare ține ocupat un thread din GUNICORN_THREADS, deci limita
+# mică de aici lasă thread-uri pentru cumpărări și scanări.
+INVENTORY_STREAM_MAX_CONNECTIONS = int(os.getenv('INVENTORY_STREAM_MAX_CONNECTIONS', 4))
+
+
+class _Subscriber:
+    __slots__ = ('event_ids', 'pending', 'wakeup')
+
+    def __init__(self, event_ids):
+        self.event_ids = event_ids
+        self.pending = {}
+        self.wakeup = threading.Event()
+
+
+class InventoryHub:
+    """
+    `loader(event_ids)` întoarce {event_id: remaining} pentru evenimentele
+    date (cele șterse lipsesc); app.py îl implementează cu un singur SELECT.
+    """
+
+    def __init__(self, app, loader, max_rate=INVENTORY_STREAM_MAX_RATE,
+                 heartbeat=INVENTORY_STREAM_HEARTBEAT):
+        self.app = app
+        self.loader = loader
+        self.interval = 1.0 / max_rate
+        self.heartbeat = heartbeat
+
+        self._subscribers = {}  # event_id -> set de _Subscriber
+        self._last = {}  # event_id -> ultimul remaining trimis
+        self._lock = threading.Lock()
+        self._has_subscribers = threading.Event()
+        self._worker_pid = None
+
+        self.ticks = 0
+        self.updates = 0
+
+    def _ensure_worker(self):
+        pid = os.getpid()
+        if self._worker_pid == pid:
+            return
+        with self._lock:
+            if self._worker_pid == pid:
+                return
+            self._worker_pid = pid
+            threading.Thread(target=self._run, name='inventory-hub', daemon=True).start()
+
+    def subscribe(self, event_ids):
+        """Înregistrează un client și întoarce starea curentă a evenimentelor lui."""
+        self._ensure_worker()
+        subscriber = _Subscriber(frozenset(event_ids))
+        with self.app.app_context():
+            snapshot = self.loader(list(subscriber.event_ids))
+        with self._lock:
+            for event_id in subscriber.event_ids:
+                self._subscribers.setdefault(event_id, set()).add(subscriber)
+                # evenimentele inexistente rămân None, ca să nu fie anunțate ca șterse
+                self._last.setdefault(event_id, snapshot.get(event_id))
+            self._has_subscribers.set()
+        return subscriber, snapshot
+
+    def unsubscribe(self, subscriber):
+        with self._lock:
+            for event_id in subscriber.event_ids:
+                subscribers = self._subscribers.get(event_id)
+                if subscribers is None:
+                    continue
+                subscribers.discard(subscriber)
+                if not subscribers:
+                    del self._subscribers[event_id]
+                    self._last.pop(event_id, None)
+            if not self._subscribers:
+                self._has_subscribers.clear()
+
+    def _run(self):
+        while True:
+            self._has_subscribers.wait()
+            started = time.monotonic()
+            try:
+                self.tick()
+            except Exception as e:
+                print(f"Inventory hub error: {e}")
+            time.sleep(max(self.interval - (time.monotonic() - started), 0))
+
+    def tick(self):
+        """O interogare pentru toate evenimentele urmărite; trimite doar ce s-a schimbat."""
+        with self._lock:
+            event_ids = list(self._subscribers)
+        if not event_ids:
+            return
+        with self.app.app_context():
+            current = self.loader(event_ids)
+        self.ticks += 1
+
+        with self._lock:
+            for event_id in event_ids:
+                # eveniment șters: clienții primesc null o singură dată
+                remaining = current.get(event_id)
+                if event_id not in self._subscribers or self._last[event_id] == remaining:
+                    continue
+                self._last[event_id] = remaining
+                for subscriber in self._subscribers[event_id]:
+                    subscriber.pending[event_id] = remaining
+                    subscriber.wakeup.set()
+                self.updates += 1
+
+    def stream(self, event_ids):
+        """
+        Generatorul răspunsului text/event-stream pentru un client. Abonarea se
+        face la prima iterație, ca o conexiune închisă înainte să înceapă
+        stream-ul să nu rămână înregistrată.
+        """
+        subscriber, snapshot = self.subscribe(event_ids)
+        try:
+            yield f'retry: {int(self.heartbeat * 1000)}\n'
+            yield self._message(sorted(snapshot.items()))
+            while True:
+                if not subscriber.wakeup.wait(self.heartbeat):
+                    yield ': keepalive\n\n'
+                    continue
+                with self._lock:
+                    changes, subscriber.pending = subscriber.pending, {}
+                    subscriber.wakeup.clear()
+                if changes:
+                    yield self._message(sorted(changes.items()))
+        finally:
+            self.unsubscribe(subscriber)
+
+    @staticmethod
+    def _message(pairs):
+        return 'event: inventory\ndata: ' + json.dumps(pairs, separators=(',', ':')) + '\n\n'
+
+    def connections(self):
+        with self._lock:
+            return len({s for subscribers in self._subscribers.values() for s in subscribers})
+
+    def stats(self):
+        with self._lock:
+            events = len(self._subscribers)
+        return {'connections': self.connections(), 'events': events, 'ticks': self.ticks, 'updates': self.updates}
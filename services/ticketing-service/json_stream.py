@@ -0,0 +1,86 @@
+"""
+Serializare JSON pentru listele mari (exporturi de admin / organizator).
+
+Același fișier este copiat în serviciile care îl folosesc (ticketing,
+notification).
+
+- dumps() folosește orjson dacă e instalat (de câteva ori mai rapid decât
+  json și serializează direct datetime-urile, fără isoformat() în Python);
+  fără el, json din biblioteca standard dă același rezultat;
+- view-urile citesc tupluri de coloane (select(Model.col, ...)), nu obiecte
+  ORM, deci nu se construiesc instanțe și nu se urmăresc în sesiune;
+- streamed() trimite rezultatul chunked, în loturi de STREAM_BATCH_SIZE
+  rânduri, ca array JSON sau NDJSON (?format=ndjson). Interogarea se execută
+  cu yield_per, adică un cursor pe server în Postgres (psycopg2): memoria
+  folosită rămâne aceeași indiferent câte rânduri are rezultatul.
+"""
+import json
+import os
+import time
+
+from flask import Response, request, stream_with_context
+
+from metrics import JSON_SERIALIZATION
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+STREAM_BATCH_SIZE = int(os.getenv('STREAM_BATCH_SIZE', 500))
+JSON_MIMETYPE = 'application/json'
+NDJSON_MIMETYPE = 'application/x-ndjson'
+
+
+def _default(value):
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    raise TypeError(f'Object of type {type(value).__name__} is not JSON serializable')
+
+
+def dumps(obj) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(',', ':'), ensure_ascii=False, default=_default).encode('utf-8')
+
+
+def json_response(obj, status=200):
+    """Ca jsonify, dar cu dumps(): datetime-urile ies în ISO 8601."""
+    started = time.perf_counter()
+    body = dumps(obj)
+    JSON_SERIALIZATION.observe(time.perf_counter() - started)
+    return Response(body, status, mimetype=JSON_MIMETYPE)
+
+
+def wants_ndjson() -> bool:
+    return request.args.get('format', '').lower() == 'ndjson'
+
+
+def streamed(result, to_item, batch_size=STREAM_BATCH_SIZE):
+    """
+    Răspuns chunked din `result` (un Result executat cu yield_per), fiecare
+    rând trecut prin to_item(). Rezultatul se închide și dacă clientul se
+    deconectează la jumătate.
+    """
+    ndjson = wants_ndjson()
+
+    def generate():
+        try:
+            written = False
+            if not ndjson:
+                yield b'['
+            for rows in result.partitions(batch_size):
+                items = [dumps(to_item(row)) for row in rows]
+                if ndjson:
+                    yield b'\n'.join(items) + b'\n'
+                else:
+                    yield (b',' if written else b'') + b','.join(items)
+                written = True
+            if not ndjson:
+                yield b']'
+        finally:
+            result.close()
+
+    return Response(stream_with_context(generate()), 200,
+                    mimetype=NDJSON_MIMETYPE if ndjson else JSON_MIMETYPE)
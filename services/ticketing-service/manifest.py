@@ -0,0 +1,120 @@
+"""
+Manifeste pentru validarea offline a biletelor la porți.
+
+Un manifest conține codurile valide (nefolosite) ale unui eveniment ca
+array sortat de digest-uri trunchiate sha256, concatenate și codate base64:
+scanner-ul caută binar în memorie, fără să atingă baza de date. Versiunea
+este un timestamp în milisecunde; cu `since=<versiune>` se trimit doar
+codurile adăugate (cumpărate) și cele scoase (folosite) între timp, după ora
+serverului la care s-a schimbat biletul (tickets.changed_at), nu după used_at.
+
+Manifestul e semnat cu HMAC-SHA256, ca un scanner să nu accepte o listă
+modificată pe drum. Cheia (MANIFEST_SIGNING_KEY) nu are valoare implicită:
+una publică, din repo, ar lăsa pe oricine să semneze un manifest. Fără ea
+serviciul pornește, dar GET /events/<id>/manifest răspunde 503.
+"""
+import base64
+import hashlib
+import hmac
+import json
+import os
+from bisect import bisect_left
+
+from ticket_codes import InvalidTicketCode, parse_code
+
+
+MANIFEST_SIGNING_KEY = os.getenv('MANIFEST_SIGNING_KEY', '')
+if not MANIFEST_SIGNING_KEY:
+    print("Warning: MANIFEST_SIGNING_KEY is not set, offline gate manifests are disabled")
+MANIFEST_DIGEST_BYTES = int(os.getenv('MANIFEST_DIGEST_BYTES', 8))
+# Suprapunere între delta-uri: acoperă tranzacțiile care fac commit cu un
+# timestamp mai vechi decât versiunea deja trimisă
+MANIFEST_OVERLAP_MS = int(os.getenv('MANIFEST_OVERLAP_MS', 5000))
+
+MANIFEST_FORMAT = 1
+
+
+def code_digest(code: str, size: int = MANIFEST_DIGEST_BYTES) -> bytes:
+    return hashlib.sha256(code.encode('utf-8')).digest()[:size]
+
+
+def pack_codes(codes, size: int = MANIFEST_DIGEST_BYTES) -> str:
+    """Digest-urile codurilor, sortate și concatenate, în base64."""
+    digests = sorted({code_digest(code, size) for code in codes})
+    return base64.b64encode(b''.join(digests)).decode('ascii')
+
+
+def unpack_digests(packed: str, size: int = MANIFEST_DIGEST_BYTES):
+    raw = base64.b64decode(packed)
+    return [raw[i:i + size] for i in range(0, len(raw), size)]
+
+
+def _canonical(manifest) -> bytes:
+    body = {k: v for k, v in manifest.items() if k != 'signature'}
+    return json.dumps(body, sort_keys=True, separators=(',', ':')).encode('utf-8')
+
+
+def sign_manifest(manifest, key: str = MANIFEST_SIGNING_KEY):
+    manifest['signature'] = hmac.new(key.encode('utf-8'), _canonical(manifest), hashlib.sha256).hexdigest()
+    return manifest
+
+
+def verify_manifest(manifest, key: str = MANIFEST_SIGNING_KEY) -> bool:
+    expected = hmac.new(key.encode('utf-8'), _canonical(manifest), hashlib.sha256).hexdigest()
+    return hmac.compare_digest(expected, manifest.get('signature', ''))
+
+
+class OfflineManifest:
+    """
+    Partea de scanner: ține digest-urile sortate în memorie și aplică
+    delta-urile. Folosit de benchmark-uri și ca referință pentru aplicația
+    de la poartă.
+    """
+
+    def __init__(self, key: str = MANIFEST_SIGNING_KEY):
+        self.key = key
+        self.version = None
+        self.size = MANIFEST_DIGEST_BYTES
+        self._digests = []
+        # codurile validate local rămân folosite chiar dacă un delta le mai
+        # aduce o dată (poarta nu s-a sincronizat încă cu serverul)
+        self._used = set()
+
+    def apply(self, manifest):
+        if not verify_manifest(manifest, self.key):
+            raise ValueError('invalid manifest signature')
+        self.size = manifest['digest_bytes']
+        if manifest['full']:
+            digests = set(unpack_digests(manifest['codes'], self.size))
+        else:
+            digests = set(self._digests)
+            digests.update(unpack_digests(manifest['added'], self.size))
+            digests.difference_update(unpack_digests(manifest['removed'], self.size))
+        digests.difference_update(self._used)
+        self._digests = sorted(digests)
+        self.version = manifest['version']
+
+    def _find(self, code):
+        """Poziția codului în array; None dacă lipsește sau nu trece cifra de control."""
+        try:
+            digest = code_digest(parse_code(code).code, self.size)
+        except InvalidTicketCode:
+            return None, None
+        index = bisect_left(self._digests, digest)
+        if index < len(self._digests) and self._digests[index] == digest:
+            return index, digest
+        return None, digest
+
+    def __contains__(self, code):
+        return self._find(code)[0] is not None
+
+    def mark_used(self, code):
+        index, digest = self._find(code)
+        if index is None:
+            return False
+        del self._digests[index]
+        self._used.add(digest)
+        return True
+
+    def __len__(self):
+        return len(self._digests)
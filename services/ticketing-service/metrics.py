@@ -0,0 +1,159 @@
+"""
+Metrici Prometheus expuse pe GET /metrics.
+
+Același fișier este copiat în fiecare serviciu (ticketing, user-profile,
+notification), ca auth_cache.py.
+
+- latența fiecărei cereri, pe rută (șablonul Flask, ex. /events/<int:event_id>)
+  și status, plus timpul de serializare JSON;
+- durata instrucțiunilor SQL, pe tip (SELECT, INSERT, ...), și descărcările
+  JWKS de la Keycloak (JWKSKeyStore le raportează prin observe_jwks_fetch);
+- valorile de tip nivel (conexiuni folosite din pool, cozi în memorie) sunt
+  citite la METRICS_SAMPLE_INTERVAL secunde de un thread per worker, din
+  stats()-urile existente, nu pe calea cererii.
+
+Pe calea unei cereri instrumentarea înseamnă câteva observări în
+histograme (microsecunde, fără I/O), deci rămâne pornită și la cumpărare.
+
+Sub gunicorn fiecare worker are propriile valori; gunicorn.conf.py setează
+PROMETHEUS_MULTIPROC_DIR, iar /metrics întoarce atunci suma tuturor worker-elor.
+"""
+import os
+import threading
+import time
+
+from flask import Response, g, request
+from flask.json.provider import DefaultJSONProvider
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Gauge, Histogram, generate_latest, multiprocess,
+)
+from sqlalchemy import event as sa_event
+
+
+METRICS_SAMPLE_INTERVAL = float(os.getenv('METRICS_SAMPLE_INTERVAL', 5))
+
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+SQL_OPERATIONS = frozenset({'SELECT', 'INSERT', 'UPDATE', 'DELETE'})
+
+REQUEST_LATENCY = Histogram(
+    'http_request_duration_seconds', 'Latența cererilor HTTP', ['method', 'route', 'status'],
+    buckets=LATENCY_BUCKETS,
+)
+JSON_SERIALIZATION = Histogram(
+    'json_serialization_duration_seconds', 'Timpul petrecut în serializarea JSON a răspunsurilor',
+    buckets=LATENCY_BUCKETS,
+)
+DB_STATEMENT_LATENCY = Histogram(
+    'db_statement_duration_seconds', 'Durata instrucțiunilor SQL', ['operation'], buckets=LATENCY_BUCKETS,
+)
+AUTH_TOKEN_CACHE = Counter(
+    'auth_token_cache_total', 'Token-uri verificate din cache (hit) sau cu RSA (miss)', ['result'],
+)
+JWKS_FETCH_LATENCY = Histogram(
+    'keycloak_jwks_fetch_duration_seconds', 'Descărcările cheilor publice de la Keycloak', ['outcome'],
+    buckets=LATENCY_BUCKETS,
+)
+DB_POOL_CHECKED_OUT = Gauge(
+    'db_pool_checked_out', 'Conexiuni din pool folosite acum', multiprocess_mode='livesum',
+)
+DB_POOL_SIZE = Gauge('db_pool_size', 'Dimensiunea pool-ului de conexiuni', multiprocess_mode='livesum')
+
+
+def observe_jwks_fetch(seconds, ok):
+    JWKS_FETCH_LATENCY.labels('ok' if ok else 'error').observe(seconds)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    # pe contextul instrucțiunii: dacă ea eșuează, nu rămâne nimic agățat de conexiune
+    context.metrics_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(context, 'metrics_started', None)
+    if started is None:
+        return
+    operation = statement.lstrip()[:6].upper()
+    DB_STATEMENT_LATENCY.labels(operation if operation in SQL_OPERATIONS else 'OTHER').observe(
+        time.perf_counter() - started
+    )
+
+
+class _TimedJSONProvider(DefaultJSONProvider):
+    def dumps(self, obj, **kwargs):
+        started = time.perf_counter()
+        try:
+            return super().dumps(obj, **kwargs)
+        finally:
+            JSON_SERIALIZATION.observe(time.perf_counter() - started)
+
+
+class Metrics:
+    def __init__(self, app, db, interval=METRICS_SAMPLE_INTERVAL):
+        self.app = app
+        self.interval = interval
+        self._sampled = []  # (nume, gauge, funcție fără argumente)
+        self._worker_pid = None
+        self._lock = threading.Lock()
+
+        app.json = _TimedJSONProvider(app)
+        app.before_request(self._before_request)
+        app.after_request(self._after_request)
+        app.add_url_rule('/metrics', 'metrics', self.render, methods=['GET'])
+
+        with app.app_context():
+            engine = db.engine
+        sa_event.listen(engine, 'before_cursor_execute', _before_cursor_execute)
+        sa_event.listen(engine, 'after_cursor_execute', _after_cursor_execute)
+        # SQLite în memorie folosește un pool fără dimensiune
+        if hasattr(engine.pool, 'checkedout'):
+            self._sampled.append(('db_pool_checked_out', DB_POOL_CHECKED_OUT, engine.pool.checkedout))
+            self._sampled.append(('db_pool_size', DB_POOL_SIZE, engine.pool.size))
+
+    def gauge(self, name, documentation, read):
+        """Gauge citit periodic cu read(); sub gunicorn se adună pe worker-ele în viață."""
+        self._sampled.append((name, Gauge(name, documentation, multiprocess_mode='livesum'), read))
+
+    def _ensure_sampler(self):
+        # După fork (gunicorn) thread-ul părintelui nu mai există în copil
+        pid = os.getpid()
+        if self._worker_pid == pid:
+            return
+        with self._lock:
+            if self._worker_pid == pid:
+                return
+            self._worker_pid = pid
+            threading.Thread(target=self._run, name='metrics-sampler', daemon=True).start()
+
+    def _run(self):
+        while True:
+            self.sample()
+            time.sleep(self.interval)
+
+    def sample(self):
+        for name, gauge, read in self._sampled:
+            try:
+                gauge.set(read())
+            except Exception as e:
+                print(f"Metrics sample failed for {name}: {e}")
+
+    def _before_request(self):
+        self._ensure_sampler()
+        g.metrics_started = time.perf_counter()
+
+    def _after_request(self, response):
+        started = g.pop('metrics_started', None)
+        if started is not None:
+            route = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+            REQUEST_LATENCY.labels(request.method, route, str(response.status_code)).observe(
+                time.perf_counter() - started
+            )
+        return response
+
+    def render(self):
+        registry = REGISTRY
+        if os.getenv('PROMETHEUS_MULTIPROC_DIR'):
+            registry = CollectorRegistry()
+            multiprocess.MultiProcessCollector(registry)
+        # valorile acestui worker sunt proaspete; ale celorlalte au cel mult `interval` secunde
+        self.sample()
+        return Response(generate_latest(registry), content_type=CONTENT_TYPE_LATEST)
@@ -0,0 +1,95 @@
+"""
+Migrări pentru bazele de date create de versiuni mai vechi ale serviciului.
+
+db.create_all() creează doar tabelele care lipsesc: într-un tabel existent
+(events și tickets există din prima versiune, pe volumul postgres-data) nu
+adaugă nici coloane, nici indexuri. migrate() rulează la pornire (init_db,
+o dată per replică) și aduce schema la zi. Fiecare pas verifică singur dacă
+mai e necesar, deci migrarea poate rula de oricâte ori.
+
+Pe Postgres totul se face într-o singură tranzacție (DDL-ul e tranzacțional),
+sub un advisory lock: replicile care pornesc simultan migrează pe rând, iar
+un pas eșuat nu lasă schema pe jumătate modificată. Indexurile noi se creează
+fără CONCURRENTLY, deci pe un tabel mare blochează scrierile cât se construiesc.
+
+Indexul unic pe tickets.code cere coduri distincte, dar codurile vechi (8
+caractere hex aleatoare) se pot repeta. Înainte de index, biletele cu un cod
+deja folosit primesc un cod nou (primul bilet, cel mai vechi, îl păstrează);
+deținătorii le văd în /my-tickets.
+"""
+from datetime import datetime
+
+from sqlalchemy import inspect, text
+
+from ticket_codes import new_code
+
+
+# Orice număr fix; același în toate replicile
+MIGRATION_LOCK_ID = 7_245_318_001
+
+# (tabel, coloană, definiție) pentru coloanele adăugate după prima versiune.
+# NOT NULL are nevoie de DEFAULT, ca rândurile existente să primească o valoare.
+ADDED_COLUMNS = (
+    ('events', 'inventory_shards', 'INTEGER NOT NULL DEFAULT 0'),
+    ('events', 'admission_rate', 'INTEGER NOT NULL DEFAULT 0'),
+    ('tickets', 'used_device', 'VARCHAR(64)'),
+    ('tickets', 'changed_at', 'TIMESTAMP'),
+)
+# Valoarea pentru rândurile existente, când coloana tocmai a fost adăugată.
+# changed_at = ora migrării: toate biletele vechi intră o dată în următorul
+# delta de manifest, în loc să lipsească din el.
+BACKFILLS = {
+    ('tickets', 'changed_at'): 'UPDATE tickets SET changed_at = :now',
+}
+
+
+def migrate(db):
+    with db.engine.begin() as conn:
+        if conn.dialect.name == 'postgresql':
+            conn.execute(text('SELECT pg_advisory_xact_lock(:id)'), {'id': MIGRATION_LOCK_ID})
+        db.metadata.create_all(conn)
+        _add_missing_columns(conn)
+        _reissue_duplicate_codes(conn)
+        _create_missing_indexes(conn, db.metadata)
+
+
+def _add_missing_columns(conn):
+    inspector = inspect(conn)
+    existing = {}
+    for table, column, definition in ADDED_COLUMNS:
+        if table not in existing:
+            existing[table] = {c['name'] for c in inspector.get_columns(table)}
+        if column in existing[table]:
+            continue
+        conn.execute(text(f'ALTER TABLE {table} ADD COLUMN {column} {definition}'))
+        if (table, column) in BACKFILLS:
+            conn.execute(text(BACKFILLS[table, column]), {'now': datetime.utcnow()})
+        existing[table].add(column)
+        print(f"Migration: added column {table}.{column}")
+
+
+def _reissue_duplicate_codes(conn):
+    if any(index['name'] == 'ix_tickets_code' for index in inspect(conn).get_indexes('tickets')):
+        return  # unicitatea e deja garantată de index
+    duplicates = conn.execute(text(
+        'SELECT id, event_id FROM tickets t WHERE EXISTS ('
+        ' SELECT 1 FROM tickets older WHERE older.code = t.code AND older.id < t.id)'
+    )).all()
+    for ticket_id, event_id in duplicates:
+        # new_code are 80 de biți aleatori: o coliziune ar opri crearea indexului, deci migrarea
+        conn.execute(text('UPDATE tickets SET code = :code WHERE id = :id'),
+                     {'code': new_code(event_id), 'id': ticket_id})
+    if duplicates:
+        print(f"Migration: reissued {len(duplicates)} duplicate ticket codes")
+
+
+def _create_missing_indexes(conn, metadata):
+    """Indexurile din modele (inclusiv unique=True / index=True pe coloane) care lipsesc."""
+    inspector = inspect(conn)
+    for table in metadata.sorted_tables:
+        existing = {index['name'] for index in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name in existing:
+                continue
+            index.create(conn)
+            print(f"Migration: created index {index.name}")
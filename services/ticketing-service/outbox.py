@@ -0,0 +1,113 @@
+"""
+Relay pentru outbox-ul tranzacțional al ticketing-service.
+
+Mesajele `ticket_booked` se scriu în tabela outbox în aceeași tranzacție cu
+biletele; un thread per worker le citește în loturi mari, le publică prin
+RabbitPublisher (confirmate de broker per lot), le marchează trimise și șterge periodic
+rândurile vechi. Livrarea este at-least-once: un crash între publicare și
+commit poate retrimite un lot.
+"""
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import delete, select, update
+
+
+OUTBOX_BATCH_SIZE = int(os.getenv('OUTBOX_BATCH_SIZE', 500))
+OUTBOX_POLL_INTERVAL = float(os.getenv('OUTBOX_POLL_INTERVAL', 1))
+OUTBOX_PUBLISH_TIMEOUT = float(os.getenv('OUTBOX_PUBLISH_TIMEOUT', 10))
+OUTBOX_RETENTION_HOURS = float(os.getenv('OUTBOX_RETENTION_HOURS', 24))
+OUTBOX_TRIM_INTERVAL = float(os.getenv('OUTBOX_TRIM_INTERVAL', 300))
+
+
+class OutboxRelay:
+    def __init__(self, app, db, model, publisher, batch_size=OUTBOX_BATCH_SIZE):
+        self.app = app
+        self.db = db
+        self.model = model
+        self.publisher = publisher
+        self.batch_size = batch_size
+
+        self._wakeup = threading.Event()
+        self._worker_pid = None
+        self._lock = threading.Lock()
+        self._last_trim = 0.0
+
+        self.relayed = 0
+        self.trimmed = 0
+
+    def wake(self):
+        """Apelat după commit-ul unei cumpărări, ca mesajul să plece fără să aștepte poll-ul."""
+        self.start()
+        self._wakeup.set()
+
+    def start(self):
+        pid = os.getpid()
+        if self._worker_pid == pid:
+            return
+        with self._lock:
+            if self._worker_pid == pid:
+                return
+            self._worker_pid = pid
+            threading.Thread(target=self._run, name='outbox-relay', daemon=True).start()
+
+    def _run(self):
+        while True:
+            try:
+                # Cât timp găsim loturi pline, golim tabela fără pauză
+                while self.relay_once() >= self.batch_size:
+                    pass
+                if time.monotonic() - self._last_trim >= OUTBOX_TRIM_INTERVAL:
+                    self.trim()
+            except Exception as e:
+                print(f"Outbox relay error: {e}")
+            self._wakeup.wait(OUTBOX_POLL_INTERVAL)
+            self._wakeup.clear()
+
+    def relay_once(self) -> int:
+        """Publică un lot de mesaje netrimise; întoarce câte au fost trimise."""
+        model, session = self.model, self.db.session
+        with self.app.app_context():
+            try:
+                # SKIP LOCKED: mai multe replici pot goli outbox-ul în paralel
+                rows = session.execute(
+                    select(model.id, model.payload)
+                    .where(model.sent_at.is_(None))
+                    .order_by(model.id)
+                    .limit(self.batch_size)
+                    .with_for_update(skip_locked=True)
+                ).all()
+                if not rows:
+                    session.rollback()
+                    return 0
+
+                if not self.publisher.publish_batch([payload.encode('utf-8') for _, payload in rows],
+                                                    timeout=OUTBOX_PUBLISH_TIMEOUT):
+                    session.rollback()
+                    return 0
+
+                session.execute(
+                    update(model)
+                    .where(model.id.in_([row_id for row_id, _ in rows]))
+                    .values(sent_at=datetime.utcnow())
+                )
+                session.commit()
+            except Exception:
+                session.rollback()
+                raise
+        self.relayed += len(rows)
+        return len(rows)
+
+    def trim(self):
+        """Șterge mesajele trimise mai vechi de OUTBOX_RETENTION_HOURS."""
+        self._last_trim = time.monotonic()
+        cutoff = datetime.utcnow() - timedelta(hours=OUTBOX_RETENTION_HOURS)
+        with self.app.app_context():
+            result = self.db.session.execute(delete(self.model).where(self.model.sent_at < cutoff))
+            self.db.session.commit()
+        self.trimmed += result.rowcount or 0
+
+    def stats(self):
+        return {'relayed': self.relayed, 'trimmed': self.trimmed}
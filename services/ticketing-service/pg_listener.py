@@ -0,0 +1,91 @@
+"""
+Invalidare de cache-uri între worker-e și replici prin Postgres LISTEN/NOTIFY.
+
+Scriitorul apelează notify() în tranzacția care modifică datele; Postgres
+livrează notificarea abia la commit, tuturor conexiunilor care ascultă pe
+canal. Fiecare worker ține o conexiune dedicată, într-un thread separat.
+"""
+import os
+import select
+import threading
+import time
+
+from sqlalchemy import text
+
+
+PG_LISTEN_RECONNECT_DELAY = float(os.getenv('PG_LISTEN_RECONNECT_DELAY', 5))
+
+
+def notify(session, channel, payload=''):
+    """Trimite NOTIFY în tranzacția curentă (doar pe Postgres; altfel nu face nimic)."""
+    if session.get_bind().dialect.name == 'postgresql':
+        session.execute(text('SELECT pg_notify(:channel, :payload)'),
+                        {'channel': channel, 'payload': payload})
+
+
+class PgNotifyListener:
+    def __init__(self, database_url):
+        self.database_url = database_url
+        self._callbacks = {}
+        self._worker_pid = None
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self):
+        return self.database_url.startswith('postgresql')
+
+    def subscribe(self, channel, callback):
+        """`callback(payload)` rulează în thread-ul listener-ului; payload None = resincronizare completă."""
+        self._callbacks.setdefault(channel, []).append(callback)
+
+    def start(self):
+        if not self.enabled or not self._callbacks:
+            return
+        pid = os.getpid()
+        if self._worker_pid == pid:
+            return
+        with self._lock:
+            if self._worker_pid == pid:
+                return
+            self._worker_pid = pid
+            threading.Thread(target=self._run, name='pg-listener', daemon=True).start()
+
+    def _dispatch(self, channel, payload):
+        for callback in self._callbacks.get(channel, []):
+            try:
+                callback(payload)
+            except Exception as e:
+                print(f"Error handling NOTIFY on {channel}: {e}")
+
+    def _run(self):
+        import psycopg2
+
+        dsn = self.database_url.replace('postgresql+psycopg2://', 'postgresql://', 1)
+        while True:
+            conn = None
+            try:
+                conn = psycopg2.connect(dsn)
+                conn.autocommit = True
+                with conn.cursor() as cur:
+                    for channel in self._callbacks:
+                        cur.execute(f'LISTEN "{channel}"')
+                # Cât timp nu am ascultat, puteam pierde notificări: resincronizăm tot
+                for channel in self._callbacks:
+                    self._dispatch(channel, None)
+
+                while True:
+                    if select.select([conn], [], [], 60) == ([], [], []):
+                        continue
+                    conn.poll()
+                    while conn.notifies:
+                        notification = conn.notifies.pop(0)
+                        self._dispatch(notification.channel, notification.payload)
+            except Exception as e:
+                print(f"Postgres LISTEN connection error, retrying in {PG_LISTEN_RECONNECT_DELAY}s: {e}")
+            finally:
+                if conn is not None:
+                    try:
+                        conn.close()
+                    except Exception:
+                        pass
+            time.sleep(PG_LISTEN_RECONNECT_DELAY)
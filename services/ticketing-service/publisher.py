@@ -0,0 +1,223 @@
+"""
+Publisher RabbitMQ persistent pentru ticketing-service.
+
+Request-ul doar pune mesajul într-un buffer în memorie; un thread per worker
+ține conexiunea și canalul deschise, publică mesajele în loturi și se
+reconectează singur dacă broker-ul cade. Relay-ul din outbox folosește
+publish_batch(), care așteaptă confirmarea întregului lot.
+
+Un lot e confirmat într-un singur round trip: canalul e în mod tranzacțional
+(tx_select), basic_publish nu așteaptă nimic, iar tx_commit revine după ce
+broker-ul a preluat toate mesajele lotului. Cu confirm_delivery pe un
+BlockingConnection fiecare basic_publish ar aștepta ack-ul lui, adică un
+round trip per mesaj. Dacă lotul eșuează înainte de Commit-Ok, broker-ul
+aruncă mesajele necomise și lotul întreg se pune înapoi în buffer; o
+conexiune căzută chiar după commit poate duce la duplicate (at-least-once,
+ca la confirms).
+
+Cât nu are mesaje, thread-ul se trezește la PUBLISHER_IDLE_INTERVAL secunde
+și servește conexiunea (process_data_events), ca heartbeat-urile să plece și
+broker-ul să nu închidă o conexiune inactivă.
+"""
+import json
+import os
+import threading
+import time
+from collections import deque
+
+import pika
+
+
+PUBLISHER_BUFFER_SIZE = int(os.getenv('PUBLISHER_BUFFER_SIZE', 10000))
+PUBLISHER_BATCH_SIZE = int(os.getenv('PUBLISHER_BATCH_SIZE', 100))
+PUBLISHER_RECONNECT_DELAY = float(os.getenv('PUBLISHER_RECONNECT_DELAY', 2))
+PUBLISHER_HEARTBEAT = int(os.getenv('PUBLISHER_HEARTBEAT', 30))
+# Sub jumătate din heartbeat, altfel broker-ul poate declara conexiunea moartă
+PUBLISHER_IDLE_INTERVAL = float(os.getenv('PUBLISHER_IDLE_INTERVAL', 5))
+
+
+class _BatchWaiter:
+    """Semnalează când toate mesajele unui lot au fost confirmate de broker."""
+
+    def __init__(self, pending):
+        self.pending = pending
+        self.cancelled = False
+        self.done = threading.Event()
+
+    def confirm(self):
+        self.pending -= 1
+        if self.pending <= 0:
+            self.done.set()
+
+
+class RabbitPublisher:
+    """
+    `connection_factory` întoarce o conexiune compatibilă cu
+    pika.BlockingConnection; implicit se conectează la `host`. Benchmark-urile
+    îi dau un broker în proces (benchmarks/standins.py).
+    """
+
+    def __init__(self, host, queue, connection_factory=None,
+                 buffer_size=PUBLISHER_BUFFER_SIZE, batch_size=PUBLISHER_BATCH_SIZE, on_published=None):
+        self.host = host
+        self.queue = queue
+        self.buffer_size = buffer_size
+        self.batch_size = batch_size
+        self.connection_factory = connection_factory or self._connect
+        # on_published(secunde de la publish() până la confirmarea broker-ului), pentru metrici
+        self.on_published = on_published
+
+        self._buffer = deque()
+        self._cond = threading.Condition()
+        self._connection = None
+        self._channel = None
+        self._worker_pid = None
+
+        self.published = 0
+        self.dropped = 0
+        self.failures = 0
+        self.connections = 0
+        self.last_latency_ms = None
+        self.avg_latency_ms = None
+
+    def _connect(self):
+        return pika.BlockingConnection(pika.ConnectionParameters(host=self.host, heartbeat=PUBLISHER_HEARTBEAT))
+
+    def publish(self, payload) -> bool:
+        """Pune mesajul în buffer; întoarce False dacă buffer-ul e plin și mesajul e pierdut."""
+        body = payload if isinstance(payload, bytes) else json.dumps(payload).encode('utf-8')
+        self._ensure_worker()
+        with self._cond:
+            if len(self._buffer) >= self.buffer_size:
+                self.dropped += 1
+                return False
+            self._buffer.append((time.monotonic(), body, None))
+            self._cond.notify()
+        return True
+
+    def publish_batch(self, payloads, timeout=10) -> bool:
+        """
+        Publică un lot și așteaptă confirmarea tuturor mesajelor.
+        La timeout, mesajele încă nepublicate sunt anulate și întoarce False.
+        """
+        if not payloads:
+            return True
+        bodies = [p if isinstance(p, bytes) else json.dumps(p).encode('utf-8') for p in payloads]
+        waiter = _BatchWaiter(len(bodies))
+        self._ensure_worker()
+        with self._cond:
+            if len(self._buffer) + len(bodies) > self.buffer_size:
+                return False
+            now = time.monotonic()
+            self._buffer.extend((now, body, waiter) for body in bodies)
+            self._cond.notify()
+
+        if waiter.done.wait(timeout):
+            return True
+        waiter.cancelled = True
+        return False
+
+    def _ensure_worker(self):
+        # Thread-ul și conexiunea nu supraviețuiesc unui fork (gunicorn)
+        pid = os.getpid()
+        if self._worker_pid == pid:
+            return
+        with self._cond:
+            if self._worker_pid == pid:
+                return
+            self._worker_pid = pid
+            self._buffer.clear()
+            self._connection = self._channel = None
+            threading.Thread(target=self._run, name='rabbit-publisher', daemon=True).start()
+
+    def _next_batch(self):
+        """Următorul lot; listă goală dacă nu a venit nimic în PUBLISHER_IDLE_INTERVAL."""
+        with self._cond:
+            if not self._buffer:
+                self._cond.wait(PUBLISHER_IDLE_INTERVAL)
+            return [self._buffer.popleft() for _ in range(min(self.batch_size, len(self._buffer)))]
+
+    def _requeue(self, batch):
+        with self._cond:
+            self._buffer.extendleft(reversed(batch))
+
+    def _open_channel(self):
+        if self._channel is not None and self._channel.is_open:
+            return self._channel
+        self._close()
+        self._connection = self.connection_factory()
+        channel = self._connection.channel()
+        channel.queue_declare(queue=self.queue, durable=False)
+        channel.tx_select()
+        self._channel = channel
+        self.connections += 1
+        return channel
+
+    def _keep_alive(self):
+        if self._connection is None or not self._connection.is_open:
+            return
+        try:
+            # Trimite heartbeat-urile datorate și citește ce a trimis broker-ul, fără să aștepte
+            self._connection.process_data_events(0)
+        except Exception as e:
+            print(f"RabbitMQ connection lost while idle: {e}")
+            self._close()
+
+    def _close(self):
+        try:
+            if self._connection is not None and self._connection.is_open:
+                self._connection.close()
+        except Exception:
+            pass
+        self._connection = self._channel = None
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            if not batch:
+                self._keep_alive()
+                continue
+            sent = [(enqueued_at, body, waiter) for enqueued_at, body, waiter in batch
+                    if waiter is None or not waiter.cancelled]
+            try:
+                channel = self._open_channel()
+                for _, body, _ in sent:
+                    channel.basic_publish(exchange='', routing_key=self.queue, body=body)
+                channel.tx_commit()
+            except Exception as e:
+                self.failures += 1
+                print(f"RabbitMQ publish failed ({len(sent)} messages requeued): {e}")
+                self._requeue(sent)
+                self._close()
+                time.sleep(PUBLISHER_RECONNECT_DELAY)
+                continue
+
+            for enqueued_at, _, waiter in sent:
+                self.published += 1
+                self._record_latency(enqueued_at)
+                if waiter is not None:
+                    waiter.confirm()
+
+    def _record_latency(self, enqueued_at):
+        latency = (time.monotonic() - enqueued_at) * 1000
+        if self.on_published is not None:
+            self.on_published(latency / 1000)
+        self.last_latency_ms = latency
+        if self.avg_latency_ms is None:
+            self.avg_latency_ms = latency
+        else:
+            self.avg_latency_ms = 0.9 * self.avg_latency_ms + 0.1 * latency
+
+    def queue_depth(self) -> int:
+        return len(self._buffer)
+
+    def stats(self):
+        return {
+            'queue_depth': self.queue_depth(),
+            'published': self.published,
+            'dropped': self.dropped,
+            'failures': self.failures,
+            'connections': self.connections,
+            'last_latency_ms': round(self.last_latency_ms, 2) if self.last_latency_ms is not None else None,
+            'avg_latency_ms': round(self.avg_latency_ms, 2) if self.avg_latency_ms is not None else None,
+        }
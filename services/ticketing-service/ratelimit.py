@@ -0,0 +1,120 @@
+"""
+Rate limiting per utilizator cu algoritmul "sliding window counter".
+
+Pentru fiecare cheie ținem doar două numere: cererile din fereastra curentă
+și cele din fereastra anterioară, ponderate cu cât a mai rămas din ea. Asta
+înseamnă memorie O(1) per utilizator activ, indiferent de limită.
+
+Backend-uri:
+- MemoryRateLimitBackend: în proces, mărginit (LRU + evicție a cheilor inactive);
+- SharedRateLimitBackend: contoare partajate cu INCR atomic (Redis), ca
+  limitele să fie aceleași pe toate worker-ele și replicile.
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+
+
+RATE_LIMIT_BACKEND = os.getenv('RATE_LIMIT_BACKEND', 'memory')
+RATE_LIMIT_MAX_KEYS = int(os.getenv('RATE_LIMIT_MAX_KEYS', 100000))
+REDIS_URL = os.getenv('REDIS_URL', 'redis://redis:6379/0')
+
+
+class MemoryRateLimitBackend:
+    def __init__(self, max_keys=RATE_LIMIT_MAX_KEYS):
+        self.max_keys = max_keys
+        # cheie -> [index fereastră, cereri curente, cereri anterioare, expiră la]
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def hit(self, key, window_index, weight, limit, window_seconds):
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            current = previous = 0
+            if entry is not None:
+                if entry[0] == window_index:
+                    current, previous = entry[1], entry[2]
+                elif entry[0] == window_index - 1:
+                    previous = entry[1]
+
+            allowed = previous * weight + current + 1 <= limit
+            if allowed:
+                current += 1
+            self._entries[key] = [window_index, current, previous, (window_index + 2) * window_seconds]
+            self._entries.move_to_end(key)
+            self._evict(now)
+        return allowed
+
+    def _evict(self, now):
+        # Cheile atinse cel mai demult sunt la început: le scoatem cât sunt
+        # inactive (nu mai contează pentru nicio fereastră) sau peste limită
+        while self._entries:
+            entry = next(iter(self._entries.values()))
+            if entry[3] > now and len(self._entries) <= self.max_keys:
+                break
+            self._entries.popitem(last=False)
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class SharedRateLimitBackend:
+    """
+    Contoare partajate într-un store cu INCR atomic. `client` are interfața
+    redis-py folosită aici (pipeline, incr, expire, get, decr); în benchmark-uri
+    se folosește LocalCounterStore din benchmarks/standins.py.
+    """
+
+    def __init__(self, client, prefix='rl'):
+        self.client = client
+        self.prefix = prefix
+
+    @classmethod
+    def from_url(cls, url=REDIS_URL):
+        import redis
+        return cls(redis.Redis.from_url(url, socket_timeout=0.5))
+
+    def hit(self, key, window_index, weight, limit, window_seconds):
+        current_key = f'{self.prefix}:{key}:{window_index}'
+        previous_key = f'{self.prefix}:{key}:{window_index - 1}'
+
+        # Un singur round trip: incrementăm întâi, apoi dăm înapoi dacă am
+        # depășit. Două cereri simultane pot fi ambele refuzate, dar limita
+        # nu e niciodată depășită.
+        pipe = self.client.pipeline(transaction=False)
+        pipe.incr(current_key)
+        pipe.expire(current_key, 2 * window_seconds)
+        pipe.get(previous_key)
+        current, _, previous = pipe.execute()
+
+        if int(previous or 0) * weight + int(current) <= limit:
+            return True
+        self.client.decr(current_key)
+        return False
+
+
+class SlidingWindowLimiter:
+    def __init__(self, backend, limit, window_seconds):
+        self.backend = backend
+        self.limit = limit
+        self.window_seconds = window_seconds
+
+    def allow(self, key) -> bool:
+        now = time.time()
+        window_index = int(now // self.window_seconds)
+        # Cât din fereastra anterioară se mai suprapune cu fereastra glisantă
+        weight = 1 - (now % self.window_seconds) / self.window_seconds
+        try:
+            return self.backend.hit(key, window_index, weight, self.limit, self.window_seconds)
+        except Exception as e:
+            # Dacă store-ul partajat nu răspunde, nu blocăm cumpărările
+            print(f"Rate limit backend error, allowing request: {e}")
+            return True
+
+
+def create_rate_limit_backend(name=RATE_LIMIT_BACKEND):
+    if name == 'redis':
+        return SharedRateLimitBackend.from_url()
+    return MemoryRateLimitBackend()
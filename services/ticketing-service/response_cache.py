@@ -0,0 +1,133 @@
+"""
+Cache de răspunsuri pentru citirile publice de evenimente (GET /events,
+GET /events/<id>), cu ETag-uri puternice și răspunsuri 304.
+
+Fiecare intrare ține body-ul deja serializat și versiunile datelor din care
+a fost construit. Versiunile se incrementează per eveniment:
+- schimbările de structură (create / delete) invalidează imediat;
+- cumpărările schimbă doar stocul: intrarea mai poate fi servită încă
+  `staleness` secunde, ca un val de citiri în timpul unui on-sale să nu
+  reconstruiască lista după fiecare bilet vândut.
+Toate intrările expiră oricum după `ttl` secunde, ceea ce mărginește cât de
+vechi poate fi stocul afișat când cumpărarea s-a făcut pe alt worker.
+"""
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+
+from flask import make_response, request
+
+
+RESPONSE_CACHE_SIZE = int(os.getenv('RESPONSE_CACHE_SIZE', 1000))
+EVENT_CACHE_STALENESS = float(os.getenv('EVENT_CACHE_STALENESS', 2))
+EVENT_CACHE_TTL = float(os.getenv('EVENT_CACHE_TTL', 10))
+
+# Header-ele pe care le păstrăm din răspunsul original
+_STORED_HEADERS = ('Content-Type', 'X-Next-Cursor')
+
+
+class ResponseCache:
+    def __init__(self, max_entries=RESPONSE_CACHE_SIZE, staleness=EVENT_CACHE_STALENESS, ttl=EVENT_CACHE_TTL):
+        self.max_entries = max_entries
+        self.staleness = staleness
+        self.ttl = ttl
+
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        # None = catalogul (orice listă de evenimente). Doar bump() adaugă chei:
+        # o citire pentru un id oarecare nu trebuie să crească dict-urile
+        self._structure = {}
+        self._inventory = {}
+
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+
+    def bump(self, event_id=None, inventory_only=False):
+        """Marchează evenimentul (și catalogul) ca modificat; event_id None = tot."""
+        versions = self._inventory if inventory_only else self._structure
+        with self._lock:
+            if event_id is None and not inventory_only:
+                self._entries.clear()
+            if event_id is not None:
+                versions[event_id] = versions.get(event_id, 0) + 1
+            versions[None] = versions.get(None, 0) + 1
+
+    def _versions(self, scope):
+        return self._structure.get(scope, 0), self._inventory.get(scope, 0)
+
+    def _lookup(self, key, scope):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            versions, stored_at, body, etag, status, headers = entry
+            age = time.monotonic() - stored_at
+            structure, inventory = self._versions(scope)
+            if (age >= self.ttl or versions[0] != structure
+                    or (versions[1] != inventory and age >= self.staleness)):
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def _store(self, key, versions, body, etag, status, headers):
+        with self._lock:
+            self._entries[key] = (versions, time.monotonic(), body, etag, status, headers)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def cached(self, scope_arg=None):
+        """
+        Decorator pentru view-uri GET publice. `scope_arg` este numele
+        argumentului de rută care identifică evenimentul (None = catalogul).
+        """
+        def decorator(f):
+            @wraps(f)
+            def wrapped(*args, **kwargs):
+                scope = kwargs.get(scope_arg) if scope_arg else None
+                key = (request.path, tuple(sorted(request.args.items(multi=True))))
+
+                entry = self._lookup(key, scope)
+                if entry is not None:
+                    self.hits += 1
+                    _, _, body, etag, status, headers = entry
+                else:
+                    self.misses += 1
+                    # Versiunile se citesc înainte de construire: o modificare
+                    # concurentă lasă intrarea cu versiunea veche, deci invalidă
+                    with self._lock:
+                        versions = self._versions(scope)
+                    response = make_response(f(*args, **kwargs))
+                    if response.status_code != 200:
+                        return response
+                    body = response.get_data()
+                    etag = hashlib.sha1(body).hexdigest()
+                    status = response.status_code
+                    headers = [(k, response.headers[k]) for k in _STORED_HEADERS if k in response.headers]
+                    self._store(key, versions, body, etag, status, headers)
+
+                if request.if_none_match.contains(etag):
+                    self.not_modified += 1
+                    response = make_response('', 304)
+                else:
+                    response = make_response(body, status, headers)
+                response.set_etag(etag)
+                response.headers['Cache-Control'] = 'no-cache'
+                return response
+
+            return wrapped
+
+        return decorator
+
+    def stats(self):
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'not_modified': self.not_modified,
+            'size': len(self._entries),
+        }
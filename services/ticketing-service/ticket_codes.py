@@ -0,0 +1,90 @@
+"""
+Formatul codurilor de bilet.
+
+Cod nou:  <eveniment>-<aleator><control>, ex: 1Z-WR57J3M2KHTPXPD5J
+- eveniment: id-ul evenimentului în Crockford base32, ca scanarea să meargă
+  direct pe partiția / indexul evenimentului;
+- aleator: 80 de biți (16 caractere), practic fără coliziuni și la milioane
+  de bilete;
+- control: o cifră Luhn mod 32 peste eveniment + aleator, ca o greșeală de
+  tastare (orice caracter greșit, aproape toate inversările de caractere
+  vecine) să fie respinsă fără să întrebăm baza de date.
+
+Codurile vechi (8 caractere hex, secrets.token_hex(4)) rămân valide; pentru
+ele nu știm evenimentul și nu avem cifră de control.
+"""
+import re
+import secrets
+from collections import namedtuple
+
+
+ALPHABET = '0123456789ABCDEFGHJKMNPQRSTVWXYZ'
+_VALUES = {ch: i for i, ch in enumerate(ALPHABET)}
+# Crockford: literele ușor de confundat se citesc ca cifrele respective
+_VALUES.update({'O': 0, 'I': 1, 'L': 1})
+
+RANDOM_BITS = 80
+RANDOM_CHARS = RANDOM_BITS // 5
+
+_LEGACY_RE = re.compile(r'^[0-9a-f]{8}$')
+
+ParsedCode = namedtuple('ParsedCode', ['code', 'event_id'])
+
+
+class InvalidTicketCode(ValueError):
+    pass
+
+
+def _encode(number: int, width: int = 0) -> str:
+    chars = []
+    while number:
+        number, digit = divmod(number, 32)
+        chars.append(ALPHABET[digit])
+    return ''.join(reversed(chars)).rjust(width, '0') or '0'
+
+
+def _luhn_sum(values, start_factor):
+    total, factor = 0, start_factor
+    for value in reversed(values):
+        addend = factor * value
+        total += addend // 32 + addend % 32
+        factor = 3 - factor
+    return total
+
+
+def check_char(payload: str) -> str:
+    remainder = _luhn_sum([_VALUES[ch] for ch in payload], 2) % 32
+    return ALPHABET[(32 - remainder) % 32]
+
+
+def new_code(event_id: int) -> str:
+    payload = _encode(event_id) + '-' + _encode(secrets.randbits(RANDOM_BITS), RANDOM_CHARS)
+    return payload + check_char(payload.replace('-', ''))
+
+
+def parse_code(raw: str) -> ParsedCode:
+    """
+    Normalizează și verifică un cod scanat sau tastat. Întoarce codul în
+    forma în care e stocat și id-ul evenimentului (None pentru codurile
+    vechi); InvalidTicketCode dacă formatul sau cifra de control nu se potrivesc.
+    """
+    raw = (raw or '').strip()
+    if _LEGACY_RE.match(raw.lower()):
+        return ParsedCode(raw.lower(), None)
+
+    normalized = raw.upper().replace(' ', '')
+    event_part, sep, body = normalized.partition('-')
+    if not sep or not event_part or len(event_part) > 7 or len(body) != RANDOM_CHARS + 1:
+        raise InvalidTicketCode('invalid ticket code format')
+    try:
+        values = [_VALUES[ch] for ch in event_part + body]
+    except KeyError:
+        raise InvalidTicketCode('invalid ticket code characters')
+    if _luhn_sum(values, 1) % 32 != 0:
+        raise InvalidTicketCode('invalid ticket code checksum')
+
+    canonical = ''.join(ALPHABET[v] for v in values)
+    event_id = 0
+    for value in values[:len(event_part)]:
+        event_id = event_id * 32 + value
+    return ParsedCode(canonical[:len(event_part)] + '-' + canonical[len(event_part):], event_id)
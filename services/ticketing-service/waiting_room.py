@@ -0,0 +1,229 @@
+"""
+Sală de așteptare virtuală pentru evenimentele cu vânzare aglomerată.
+
+Clientul intră în coadă (POST /events/<id>/queue) și primește un token
+semnat cu poziția lui și momentul în care e admis. Pozițiile sunt admise în
+ordine, câte una la 1/rate secunde: fiecare intrare e admisă la
+max(admiterea programată, acum - (burst - 1)/rate), iar următoarea e
+programată cu 1/rate mai târziu. O coadă goală admite deci imediat cel mult
+`burst` persoane, iar timpul în care nu a intrat nimeni nu se adună ca
+admiteri "restante" (o intrare timpurie nu mai deschide coada pentru toți
+cei care vin după o oră).
+
+Intrarea e un singur script atomic în store (în proces sau Redis, partajat
+între replici), care ține ultima admitere programată și poziția deja emisă
+fiecărui utilizator: o nouă intrare în coadă întoarce același token până
+expiră fereastra de cumpărare. Starea și verificarea la cumpărare se
+calculează doar din token, fără store și fără baza de date. Rata e cea de
+la momentul intrării; o rată schimbată se aplică celor care intră după.
+
+Token-urile se semnează cu WAITING_ROOM_SECRET, fără valoare implicită (una
+publică ar lăsa pe oricine să-și emită singur un token admis). Fără el
+serviciul pornește, dar evenimentele cu sală de așteptare răspund 503.
+La fel cu store-ul în proces și mai multe worker-e gunicorn (fiecare ar avea
+coada lui): sub gunicorn e nevoie de WAITING_ROOM_BACKEND=redis.
+"""
+import base64
+import hashlib
+import hmac
+import json
+import math
+import os
+import threading
+import time
+
+from ratelimit import RATE_LIMIT_BACKEND, REDIS_URL
+
+
+WAITING_ROOM_BACKEND = os.getenv('WAITING_ROOM_BACKEND', RATE_LIMIT_BACKEND)
+WAITING_ROOM_SECRET = os.getenv('WAITING_ROOM_SECRET', '')
+if not WAITING_ROOM_SECRET:
+    print("Warning: WAITING_ROOM_SECRET is not set, events with a waiting room cannot be joined or bought")
+# Câte poziții sunt admise imediat într-o coadă goală
+WAITING_ROOM_BURST = int(os.getenv('WAITING_ROOM_BURST', 50))
+# Cât timp după admitere rămâne valid un token
+WAITING_ROOM_ADMISSION_WINDOW = int(os.getenv('WAITING_ROOM_ADMISSION_WINDOW', 600))
+WAITING_ROOM_KEY_TTL = int(os.getenv('WAITING_ROOM_KEY_TTL', 86400))
+# Cât de des e sfătuit clientul să întrebe de stare (secunde)
+WAITING_ROOM_MIN_POLL = float(os.getenv('WAITING_ROOM_MIN_POLL', 2))
+WAITING_ROOM_MAX_POLL = float(os.getenv('WAITING_ROOM_MAX_POLL', 30))
+# Cât de des scoate store-ul în proces cheile expirate (secunde)
+WAITING_ROOM_SWEEP_INTERVAL = float(os.getenv('WAITING_ROOM_SWEEP_INTERVAL', 60))
+
+# KEYS: issued, next (admiterea programată pentru următoarea poziție), user
+# ARGV: now, 1/rate, (burst - 1)/rate, fereastra de cumpărare, TTL
+# Întoarce "poziție:admis_la", aceeași pentru un utilizator deja în coadă.
+JOIN_SCRIPT = """
+local existing = redis.call('GET', KEYS[3])
+if existing then
+    return existing
+end
+local now, interval, burst = tonumber(ARGV[1]), tonumber(ARGV[2]), tonumber(ARGV[3])
+local position = redis.call('INCR', KEYS[1])
+redis.call('EXPIRE', KEYS[1], ARGV[5])
+local admit_at = math.max(tonumber(redis.call('GET', KEYS[2]) or '0'), now - burst)
+redis.call('SET', KEYS[2], string.format('%.3f', admit_at + interval), 'EX', ARGV[5])
+local value = position .. ':' .. string.format('%.3f', admit_at)
+redis.call('SET', KEYS[3], value, 'EX', math.max(math.ceil(admit_at - now), 0) + tonumber(ARGV[4]))
+return value
+"""
+
+
+class InvalidQueueToken(ValueError):
+    pass
+
+
+def _join_local(store, keys, args):
+    """JOIN_SCRIPT pentru LocalCounters; rulează sub lock-ul store-ului."""
+    issued_key, next_key, user_key = keys
+    now, interval, burst, window, ttl = args
+    existing = store._value(user_key)
+    if existing is not None:
+        return existing.encode()
+    position = int(store._value(issued_key) or 0) + 1
+    store._put(issued_key, position, ttl)
+    admit_at = max(float(store._value(next_key) or 0), now - burst)
+    store._put(next_key, f'{admit_at + interval:.3f}', ttl)
+    value = f'{position}:{admit_at:.3f}'
+    store._put(user_key, value, max(math.ceil(admit_at - now), 0) + window)
+    return value.encode()
+
+
+_LOCAL_SCRIPTS = {JOIN_SCRIPT: _join_local}
+
+
+class LocalCounters:
+    """
+    Store în proces cu subsetul redis-py folosit aici (un singur worker /
+    dezvoltare). Cheile de utilizator nu se mai citesc după ce expiră, deci
+    expirarea la citire nu ajunge: la cel mult WAITING_ROOM_SWEEP_INTERVAL
+    secunde o scriere scoate toate cheile expirate.
+    """
+
+    def __init__(self, sweep_interval=WAITING_ROOM_SWEEP_INTERVAL):
+        self._data = {}
+        self._expires = {}
+        self._lock = threading.Lock()
+        self.sweep_interval = sweep_interval
+        self._next_sweep = time.time() + sweep_interval
+
+    def _value(self, key):
+        expires = self._expires.get(key)
+        if expires is not None and expires <= time.time():
+            self._data.pop(key, None)
+            self._expires.pop(key, None)
+        value = self._data.get(key)
+        return None if value is None else str(value)
+
+    def _put(self, key, value, ex):
+        now = time.time()
+        if now >= self._next_sweep:
+            self._sweep(now)
+        self._data[key] = value
+        self._expires[key] = now + ex
+
+    def _sweep(self, now):
+        for key in [key for key, expires in self._expires.items() if expires <= now]:
+            del self._data[key], self._expires[key]
+        self._next_sweep = now + self.sweep_interval
+
+    def __len__(self):
+        with self._lock:
+            return len(self._data)
+
+    def register_script(self, source):
+        run = _LOCAL_SCRIPTS[source]
+
+        def script(keys=(), args=()):
+            with self._lock:
+                return run(self, keys, args)
+        return script
+
+
+def create_waiting_room_store(name=WAITING_ROOM_BACKEND):
+    if name == 'redis':
+        import redis
+        return redis.Redis.from_url(REDIS_URL, socket_timeout=0.5)
+    return LocalCounters()
+
+
+class WaitingRoom:
+    def __init__(self, store, secret=WAITING_ROOM_SECRET, burst=WAITING_ROOM_BURST,
+                 admission_window=WAITING_ROOM_ADMISSION_WINDOW, prefix='wr'):
+        self.store = store
+        # store partajat între worker-e / replici (Redis)
+        self.shared = not isinstance(store, LocalCounters)
+        # motivul pentru care app.py răspunde 503, sau None; fără secret nu se
+        # emit și nu se acceptă token-uri
+        self.unavailable = None if secret else 'Waiting room is not configured (WAITING_ROOM_SECRET)'
+        self.secret = secret.encode('utf-8')
+        self.burst = burst
+        self.admission_window = admission_window
+        self.prefix = prefix
+        self._join = store.register_script(JOIN_SCRIPT)
+
+    def _sign(self, body: bytes) -> str:
+        return hmac.new(self.secret, body, hashlib.sha256).hexdigest()[:32]
+
+    def _token(self, event_id, position, sub, admit_at):
+        body = base64.urlsafe_b64encode(json.dumps([event_id, position, sub, admit_at]).encode('utf-8'))
+        return body.decode('ascii').rstrip('=') + '.' + self._sign(body.rstrip(b'='))
+
+    def parse_token(self, token):
+        """Întoarce (event_id, position, sub, admit_at); InvalidQueueToken dacă semnătura nu se potrivește."""
+        try:
+            body, signature = token.split('.')
+            if not hmac.compare_digest(self._sign(body.encode('ascii')), signature):
+                raise InvalidQueueToken('invalid queue token signature')
+            event_id, position, sub, admit_at = json.loads(base64.urlsafe_b64decode(body + '=' * (-len(body) % 4)))
+            return int(event_id), int(position), sub, float(admit_at)
+        except InvalidQueueToken:
+            raise
+        except Exception:
+            raise InvalidQueueToken('malformed queue token')
+
+    def join(self, event_id, sub, rate):
+        """Emite poziția utilizatorului (sau o întoarce pe cea deja emisă); un singur round trip la store."""
+        now = time.time()
+        keys = (f'{self.prefix}:{event_id}:issued', f'{self.prefix}:{event_id}:next',
+                f'{self.prefix}:{event_id}:user:{sub}')
+        value = self._join(keys=keys, args=(now, 1 / rate, max(self.burst - 1, 0) / rate,
+                                            self.admission_window, WAITING_ROOM_KEY_TTL))
+        position, admit_at = value.decode().split(':')
+        position, admit_at = int(position), float(admit_at)
+        return self._token(event_id, position, sub, admit_at), self.describe(event_id, position, admit_at, rate, now)
+
+    def describe(self, event_id, position, admit_at, rate, now=None):
+        """Poziția, câte persoane sunt înainte, ETA și cât să aștepte clientul până la următorul poll."""
+        now = now or time.time()
+        eta = max(admit_at - now, 0)
+        return {
+            'event_id': event_id,
+            'position': position,
+            'admitted': eta == 0,
+            'ahead': math.ceil(eta * rate),
+            'eta_seconds': math.ceil(eta),
+            'poll_after': min(max(eta / 2, WAITING_ROOM_MIN_POLL), WAITING_ROOM_MAX_POLL),
+        }
+
+    def check(self, token, event_id, sub, rate):
+        """
+        Verifică la cumpărare: token valid, pentru acest eveniment și utilizator,
+        admis și încă în fereastra de cumpărare. Întoarce (ok, motiv, stare).
+        """
+        if not token:
+            return False, 'missing X-Queue-Token, join the queue first', None
+        try:
+            token_event, position, token_sub, admit_at = self.parse_token(token)
+        except InvalidQueueToken as e:
+            return False, str(e), None
+        if token_event != event_id or token_sub != sub:
+            return False, 'queue token is for another event or user', None
+
+        now = time.time()
+        state = self.describe(event_id, position, admit_at, rate, now)
+        if not state['admitted']:
+            return False, 'not admitted yet', state
+        if now > admit_at + self.admission_window:
+            return False, 'queue token expired, please rejoin', state
+        return True, None, state
@@ -0,0 +1,191 @@
+"""
+Cache-uri folosite de verify_token: cheile publice Keycloak (JWKS) și
+token-urile deja verificate.
+
+Același fișier este copiat în fiecare serviciu (ticketing, user-profile,
+notification), pentru că fiecare imagine Docker se construiește doar din
+directorul propriu.
+"""
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+
+import jwt
+import requests
+
+
+JWKS_CACHE_TTL = float(os.getenv('JWKS_CACHE_TTL', 300))
+JWKS_MIN_REFETCH_INTERVAL = float(os.getenv('JWKS_MIN_REFETCH_INTERVAL', 10))
+JWKS_FETCH_TIMEOUT = float(os.getenv('JWKS_FETCH_TIMEOUT', 5))
+TOKEN_CACHE_SIZE = int(os.getenv('TOKEN_CACHE_SIZE', 10000))
+
+
+class JWKSKeyStore:
+    """
+    Ține cheile publice deja parsate într-un dict indexat după `kid`.
+
+    - cheile sunt reîmprospătate în background la fiecare `ttl` secunde;
+    - un `kid` necunoscut declanșează un refetch imediat, dar cel mult o dată
+      la `min_refetch_interval` secunde (un token fals nu poate bombarda Keycloak);
+    - dacă Keycloak nu răspunde, se păstrează ultimele chei bune.
+    """
+
+    def __init__(self, jwks_url, ttl=JWKS_CACHE_TTL,
+                 min_refetch_interval=JWKS_MIN_REFETCH_INTERVAL,
+                 timeout=JWKS_FETCH_TIMEOUT, on_fetch=None):
+        self.jwks_url = jwks_url
+        self.ttl = ttl
+        self.min_refetch_interval = min_refetch_interval
+        self.timeout = timeout
+        # on_fetch(secunde, ok) după fiecare descărcare (metrici, vezi metrics.py)
+        self.on_fetch = on_fetch
+
+        self._keys = {}
+        self._fetch_lock = threading.Lock()
+        self._last_attempt = 0.0
+        self._fetched_at = 0.0
+        self._refresher_pid = None
+
+    def get_key(self, kid):
+        """Întoarce cheia pentru `kid` sau None dacă nu există nici după refetch."""
+        self._ensure_refresher()
+
+        key = self._keys.get(kid)
+        if key is not None:
+            return key
+
+        with self._fetch_lock:
+            # Alt thread poate să fi adus deja cheia cât am așteptat lock-ul
+            key = self._keys.get(kid)
+            if key is None and time.monotonic() - self._last_attempt >= self.min_refetch_interval:
+                self._refresh_locked()
+                key = self._keys.get(kid)
+        return key
+
+    def refresh(self) -> bool:
+        with self._fetch_lock:
+            return self._refresh_locked()
+
+    def _refresh_locked(self) -> bool:
+        self._last_attempt = time.monotonic()
+        try:
+            response = requests.get(self.jwks_url, timeout=self.timeout)
+            response.raise_for_status()
+            jwks = response.json()
+        except Exception as e:
+            self._fetched(False)
+            print(f"JWKS refresh failed, keeping {len(self._keys)} cached keys: {e}")
+            return False
+        self._fetched(True)
+
+        keys = {}
+        for jwk in jwks.get('keys', []):
+            if jwk.get('kty') != 'RSA' or jwk.get('use', 'sig') != 'sig':
+                continue
+            try:
+                keys[jwk.get('kid')] = jwt.algorithms.RSAAlgorithm.from_jwk(jwk)
+            except Exception as e:
+                print(f"Skipping unparsable JWK {jwk.get('kid')}: {e}")
+
+        if not keys:
+            print("JWKS refresh returned no usable keys, keeping cached keys")
+            return False
+
+        # Înlocuire atomică: cititorii văd fie dict-ul vechi, fie pe cel nou
+        self._keys = keys
+        self._fetched_at = time.monotonic()
+        return True
+
+    def _fetched(self, ok):
+        if self.on_fetch is not None:
+            self.on_fetch(time.monotonic() - self._last_attempt, ok)
+
+    def _ensure_refresher(self):
+        # După fork (gunicorn) thread-ul părintelui nu mai există în copil
+        pid = os.getpid()
+        if self._refresher_pid == pid:
+            return
+        with self._fetch_lock:
+            if self._refresher_pid == pid:
+                return
+            self._refresher_pid = pid
+            threading.Thread(target=self._refresh_loop, name='jwks-refresher', daemon=True).start()
+
+    def _refresh_loop(self):
+        while True:
+            if self._keys:
+                delay = self.ttl - (time.monotonic() - self._fetched_at)
+                if delay > 0:
+                    time.sleep(delay)
+            if not self.refresh():
+                time.sleep(self.min_refetch_interval)
+
+    def stats(self):
+        return {
+            'keys': len(self._keys),
+            'age_seconds': round(time.monotonic() - self._fetched_at, 1) if self._fetched_at else None,
+        }
+
+
+class TokenCache:
+    """
+    LRU mărginit: digest-ul token-ului -> (claims, roles, sub).
+
+    Un token deja verificat nu mai trece prin verificarea RSA până la `exp`;
+    după `exp` intrarea e ignorată și jwt.decode raportează expirarea.
+    """
+
+    def __init__(self, max_size=TOKEN_CACHE_SIZE):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _digest(token):
+        return hashlib.sha256(token.encode('utf-8')).digest()
+
+    def get(self, token):
+        """Întoarce (claims, roles, sub) pentru un token valid din cache, altfel None."""
+        digest = self._digest(token)
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(digest)
+            if entry is None or entry[0] <= now:
+                if entry is not None:
+                    del self._entries[digest]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(digest)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, token, decoded):
+        """Salvează claims-urile decodate și întoarce tuplul (claims, roles, sub)."""
+        identity = (
+            decoded,
+            decoded.get('realm_access', {}).get('roles', []),
+            decoded.get('sub'),
+        )
+        exp = decoded.get('exp')
+        if not exp or self.max_size <= 0:
+            return identity
+
+        digest = self._digest(token)
+        with self._lock:
+            self._entries[digest] = (exp, identity)
+            self._entries.move_to_end(digest)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+        return identity
+
+    def stats(self):
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'size': len(self._entries),
+            'max_size': self.max_size,
+        }
@@ -53,14 +53,25 @@ else
     echo "✅ Fișier .env există deja"
 fi
 
+# Secretele ticketing-service: generate o singură dată, păstrate în .env
+add_secret() {
+    if ! grep -q "^$1=" .env; then
+        echo "$1=$(head -c 32 /dev/urandom | od -An -tx1 | tr -d ' \n')" >> .env
+        echo "🔑 $1 generat în .env"
+    fi
+}
+add_secret MANIFEST_SIGNING_KEY
+add_secret WAITING_ROOM_SECRET
+
 echo ""
 echo "📋 Pași următori:"
 echo "1. Construiește imaginile: ./build-images.sh"
-echo "2. Deploy stack: docker stack deploy -c docker-stack.yml eventflow"
+echo "2. Deploy stack (docker stack deploy nu citește .env singur):"
+echo "   set -a && . ./.env && set +a && docker stack deploy -c docker-stack.yml eventflow"
 echo "3. Așteaptă ca Keycloak să pornească (verifică: docker service logs eventflow_keycloak)"
 echo "4. Accesează Keycloak Admin Console: http://localhost:8080"
 echo "5. Obține client secret din Keycloak și actualizează .env"
-echo "6. Restart stack: docker stack rm eventflow && docker stack deploy -c docker-stack.yml eventflow"
+echo "6. Restart stack: docker stack rm eventflow && set -a && . ./.env && set +a && docker stack deploy -c docker-stack.yml eventflow"
 echo ""
 echo "✅ Setup complet!"
 